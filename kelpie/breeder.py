@@ -1,11 +1,17 @@
 import os
+import re
+import copy
 import shutil
 import subprocess
-import json
+import functools
+import shlex
+import string
 import six
 from kelpie import files_and_folders
+from kelpie.utils.serialization import load_json
 from kelpie.scheduler_settings import DEFAULT_SCHEDULER_SETTINGS
 from kelpie.scheduler_templates import SCHEDULER_TEMPLATES
+from kelpie.scheduler_status import SLURM_STATUS_CACHE
 
 
 class KelpieBreederError(Exception):
@@ -13,9 +19,99 @@ class KelpieBreederError(Exception):
     pass
 
 
+# absolute paths of all the files found so far (input files are not expected to disappear while breeding)
+_EXISTING_FILES = set()
+
+
+def _is_file(path):
+    """Same as `os.path.isfile` but remembers the files that were found, so that constructing many breeders with the
+    same settings/template files does not `stat` them over and over again.
+
+    :param path: String with the path to the file (anything else, e.g. a dictionary, is not a file)
+    :return: Boolean
+    """
+    if not isinstance(path, six.string_types):
+        return False
+    path = os.path.abspath(path)
+    if path not in _EXISTING_FILES:
+        if not os.path.isfile(path):
+            return False
+        _EXISTING_FILES.add(path)
+    return True
+
+
+class _BatchScriptTemplate(object):
+    """Batch script template, parsed once: its text and the names of the fields to be filled in."""
+
+    def __init__(self, text):
+        """
+        :param text: String with the contents of the template, with "{field}" placeholders
+        """
+        self.text = text
+        #: names of the fields, e.g. "job-name", "walltime" (without any attribute/index access)
+        self.field_names = frozenset([re.split(r'[.\[]', field_name)[0]
+                                      for _, field_name, _, _ in string.Formatter().parse(text) if field_name])
+
+    def render(self, fields):
+        """
+        :param fields: Dictionary of field name -> value
+        :return: String with the template filled in with the `fields`
+        :raise KelpieBreederError: if any of the fields in the template is not specified
+        """
+        missing_fields = self.field_names.difference(fields)
+        if missing_fields:
+            error_message = 'Fields in the batch script template not specified in the scheduler settings: {}'.format(
+                ', '.join(sorted(missing_fields)))
+            raise KelpieBreederError(error_message)
+        return self.text.format_map(fields)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_batch_script_template(path, mtime, size):
+    """Batch script template at `path`, read and parsed only once for a given modification time and size."""
+    with open(path, 'r') as fr:
+        return _BatchScriptTemplate(fr.read())
+
+
+def _load_batch_script_template(path):
+    """:return: `_BatchScriptTemplate` for the file at `path`, from the cache if the file has not changed"""
+    stat = os.stat(path)
+    return _parse_batch_script_template(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_json_file(path, mtime, size):
+    """Contents of the JSON file at `path`, parsed only once for a given modification time and size of the file."""
+    return load_json(path)
+
+
+def _load_cached_json_file(path):
+    """:return: Copy of the contents of the JSON file at `path`, from the cache if the file has not changed"""
+    stat = os.stat(path)
+    return copy.deepcopy(_parse_json_file(os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+
+
+@functools.lru_cache(maxsize=64)
+def _module_load_lines(modules):
+    """:return: String with one "module load [module]" line per module in the tuple `modules`"""
+    return '\n'.join(['module load {}'.format(module) for module in modules])
+
+
 class KelpieBreeder(object):
     """Base class to create the run directory and write batch script."""
 
+    # no per-instance __dict__: many breeders may be alive at once, e.g. for `submit_many()`
+    __slots__ = ('_input_structure_file',
+                 '_run_location',
+                 '_host_scheduler_settings',
+                 '_custom_scheduler_settings',
+                 '_batch_script_template',
+                 '_submit_batch_job',
+                 '_batch_script',
+                 'job_id',
+                 'kwargs',
+                 )
+
     def __init__(self,
                  input_structure_file=None,
                  run_location=None,
@@ -63,6 +159,10 @@ class KelpieBreeder(object):
         :param kwargs: Dictionary of other miscellaneous parameters, if any.
         """
 
+        #: Batch script rendered from the template, once requested. Reset whenever any of the settings it depends on
+        #  are set (note: modifying the settings dictionaries in place does not reset it).
+        self._batch_script = None
+
         #: VASP POSCAR file containing the structure (only VASP 5 format currently supported).
         #: `kelpie.structure.Structure` object containing VASP POSCAR data.
         self._input_structure_file = None
@@ -90,6 +190,9 @@ class KelpieBreeder(object):
         self._submit_batch_job = None
         self.submit_batch_job = submit_batch_job
 
+        #: ID of the batch job, once submitted (only for SLURM).
+        self.job_id = None
+
         #: Unsupported keyword arguments
         self.kwargs = kwargs
 
@@ -102,7 +205,7 @@ class KelpieBreeder(object):
         if not input_structure_file:
             error_message = 'Input structure file not specified'
             raise KelpieBreederError(error_message)
-        if not os.path.isfile(input_structure_file):
+        if not _is_file(input_structure_file):
             error_message = 'Specified `input_structure_file` {} not found'.format(input_structure_file)
             raise KelpieBreederError(error_message)
         self._input_structure_file = os.path.abspath(input_structure_file)
@@ -113,6 +216,7 @@ class KelpieBreeder(object):
 
     @run_location.setter
     def run_location(self, run_location):
+        self._batch_script = None
         if not run_location:
             self._run_location = os.path.dirname(os.path.abspath(self.input_structure_file))
         else:
@@ -124,12 +228,12 @@ class KelpieBreeder(object):
 
     @host_scheduler_settings.setter
     def host_scheduler_settings(self, host_scheduler_settings):
+        self._batch_script = None
         if not host_scheduler_settings:
             self._host_scheduler_settings = DEFAULT_SCHEDULER_SETTINGS['cori_knl']
             return
-        if os.path.isfile(host_scheduler_settings):
-            with open(host_scheduler_settings, 'r') as fr:
-                self._host_scheduler_settings = json.load(fr)
+        if _is_file(host_scheduler_settings):
+            self._host_scheduler_settings = _load_cached_json_file(host_scheduler_settings)
         else:
             settings = DEFAULT_SCHEDULER_SETTINGS.get(host_scheduler_settings)
             if not settings:
@@ -143,12 +247,12 @@ class KelpieBreeder(object):
 
     @custom_scheduler_settings.setter
     def custom_scheduler_settings(self, custom_scheduler_settings):
+        self._batch_script = None
         if not custom_scheduler_settings:
             self._custom_scheduler_settings = {}
             return
-        if os.path.isfile(custom_scheduler_settings):
-            with open(custom_scheduler_settings, 'r') as fr:
-                self._custom_scheduler_settings = json.load(fr)
+        if _is_file(custom_scheduler_settings):
+            self._custom_scheduler_settings = _load_cached_json_file(custom_scheduler_settings)
         else:
             self._custom_scheduler_settings = custom_scheduler_settings
 
@@ -158,10 +262,11 @@ class KelpieBreeder(object):
 
     @batch_script_template.setter
     def batch_script_template(self, batch_script_template):
+        self._batch_script = None
         if not batch_script_template:
             self._batch_script_template = SCHEDULER_TEMPLATES['cori']
             return
-        if os.path.isfile(batch_script_template):
+        if _is_file(batch_script_template):
             self._batch_script_template = batch_script_template
         else:
             template = SCHEDULER_TEMPLATES.get(batch_script_template)
@@ -188,17 +293,16 @@ class KelpieBreeder(object):
     def scheduler_script_name(self):
         return '{}.q'.format(os.path.splitext(os.path.basename(self.batch_script_template))[0])
 
-    def _get_batch_script(self):
+    def _get_scheduler_settings(self):
+        """:return: Dictionary with the host scheduler settings updated with the custom scheduler settings"""
+        return {**self.host_scheduler_settings, **self.custom_scheduler_settings}
+
+    def _get_batch_script(self, run_location=None):
         # general batch scheduler settings
-        settings = {**self.host_scheduler_settings}
-        settings.update(self.custom_scheduler_settings)
+        settings = self._get_scheduler_settings()
 
         # generate the "module load" section
-        modules = []
-        for module in settings.get('modules', []):
-            modules.append('module load {}'.format(module))
-        modules = '\n'.join(modules)
-        settings.update({'modules': modules})
+        settings['modules'] = _module_load_lines(tuple(settings.get('modules', [])))
 
         # if calculation workflow and custom calculation settings were specified,
         # write them as is into the batch script
@@ -212,32 +316,63 @@ class KelpieBreeder(object):
         calculation_params = ' '.join(calculation_params)
 
         # arguments for kelpie grazer
-        settings.update({'run_location': self.run_location,
+        settings.update({'run_location': run_location if run_location else self.run_location,
                          'calculation_params': calculation_params})
 
-        # format the template with all the arguments
-        with open(self.batch_script_template, 'r') as fr:
-            template = fr.read()
-        template = template.format(**settings, **self.kwargs)
-        return template
+        # fill in the template with all the arguments (scheduler settings take precedence over other parameters)
+        template = _load_batch_script_template(self.batch_script_template)
+        return template.render({**self.kwargs, **settings})
 
     @property
     def batch_script(self):
-        return self._get_batch_script()
-
-    def submit_job_to_scheduler(self):
-        settings = {**self.host_scheduler_settings}
-        settings.update(self.custom_scheduler_settings)
+        if self._batch_script is None:
+            self._batch_script = self._get_batch_script()
+        return self._batch_script
+
+    def submit_job_to_scheduler(self, wait=False):
+        """Submit the batch script in the run location to the scheduler. For SLURM, the ID of the job is recorded
+        in `self.job_id`.
+
+        :param wait: Boolean specifying whether to block until the job finishes ("sbatch --wait"), instead of
+                     polling for its status. Only supported for SLURM. (Default: False)
+        :return: `subprocess.CompletedProcess` for the submit command
+        :raise KelpieBreederError: if the submit command is not specified, or `wait` is requested for a scheduler
+                                   other than SLURM
+        """
+        settings = self._get_scheduler_settings()
         submit_cmd = settings.get('submit_cmd')
         if not submit_cmd:
             error_message = 'Submit command for the batch scheduler not specified'
             raise KelpieBreederError(error_message)
+
+        submit_args = [submit_cmd]
+        is_slurm = os.path.basename(submit_cmd) == 'sbatch'
+        if is_slurm:
+            submit_args.append('--parsable')
+            if wait:
+                submit_args.append('--wait')
+        elif wait:
+            error_message = 'Waiting for the job to finish is currently only supported for SLURM (sbatch)'
+            raise KelpieBreederError(error_message)
+        submit_args.append(self.scheduler_script_name)
+
         with files_and_folders.change_working_dir(self.run_location):
-            subprocess.run([submit_cmd, self.scheduler_script_name], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            submission = subprocess.run(submit_args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if is_slurm and submission.returncode == 0:
+            # "--parsable" output is "jobid[;cluster]"
+            self.job_id = submission.stdout.decode().strip().split(';')[0]
+        return submission
+
+    @property
+    def job_status(self):
+        """State of the submitted batch job (e.g. "PENDING", "RUNNING", "COMPLETED") from the process-wide
+        `squeue` cache, or None if the job was not submitted to SLURM."""
+        if not self.job_id:
+            return None
+        return SLURM_STATUS_CACHE.get(self.job_id)
 
     def _get_mpi_call(self):
-        settings = {**self.host_scheduler_settings}
-        settings.update(self.custom_scheduler_settings)
+        settings = self._get_scheduler_settings()
         mpi_call = settings.get('mpi_call')
         if not mpi_call:
             error_message = 'MPI call not specified for the host (in scheduler settings)'
@@ -254,9 +389,9 @@ class KelpieBreeder(object):
     def mpi_call(self):
         return self._get_mpi_call()
 
-    def breed(self):
+    def _prepare_run_location(self):
         """Create the directory for running calculations if not already present, copy the specified input structure,
-        write the batch script and the mpi_call command into the run location, submit the batch job.
+        write the batch script and the mpi_call command into the run location.
         """
         # create the directory structure if not already present
         if not os.path.isdir(self.run_location):
@@ -276,7 +411,118 @@ class KelpieBreeder(object):
         with open(batch_script_file, 'w') as fw:
             fw.write(self.batch_script)
 
+    def breed(self):
+        """Create the directory for running calculations if not already present, copy the specified input structure,
+        write the batch script and the mpi_call command into the run location, submit the batch job.
+        """
+        self._prepare_run_location()
         if self.submit_batch_job:
             self.submit_job_to_scheduler()
 
+    @classmethod
+    def from_directory_sweep(cls, root, structure_file_name='POSCAR', **kwargs):
+        """Create one breeder for every "[root]/*/[structure_file_name]" file. The directories are listed with
+        `os.scandir`, and the structure files found are not `stat`-ed again when the breeders are constructed.
+
+        :param root: String with the location of the directories to sweep, one calculation per directory
+        :param structure_file_name: String with the name of the structure file in each directory. (Default: "POSCAR")
+        :param kwargs: Other keyword arguments passed to the constructor of each breeder (the run location defaults
+                       to the directory of each structure file)
+        :return: List of `KelpieBreeder` objects, sorted by the path of the structure file
+        """
+        structure_files = []
+        with os.scandir(root) as root_entries:
+            for root_entry in root_entries:
+                if not root_entry.is_dir():
+                    continue
+                with os.scandir(root_entry.path) as entries:
+                    for entry in entries:
+                        if entry.name == structure_file_name and entry.is_file():
+                            structure_files.append(os.path.abspath(entry.path))
+                            break
+        structure_files.sort()
+        _EXISTING_FILES.update(structure_files)
+        return [cls(input_structure_file=structure_file, **kwargs) for structure_file in structure_files]
+
+    @staticmethod
+    def write_array_batch_script(breeders, array_location):
+        """Prepare the run location of each of the `breeders`, and write a single SLURM job array batch script that
+        grazes the i-th run location in array task i.
+
+        :param breeders: List of `KelpieBreeder` objects. All of them must share the scheduler settings, batch script
+                         template and calculation parameters, i.e., differ only in the run location.
+        :param array_location: String with the location to write the job array batch script and the list of run
+                               locations ("run_locations.txt") into.
+        :return: String with the path to the job array batch script
+        :raise KelpieBreederError: if `breeders` is empty, or if the batch scripts differ in anything other than the
+                                   run location
+        """
+        if not breeders:
+            error_message = 'No breeders specified for the job array'
+            raise KelpieBreederError(error_message)
+
+        array_location = os.path.abspath(array_location)
+        if not os.path.isdir(array_location):
+            os.makedirs(array_location)
+
+        # each array task picks its run location from line (SLURM_ARRAY_TASK_ID + 1) of the list
+        run_locations_file = os.path.join(array_location, 'run_locations.txt')
+        task_run_location = '"$(sed -n "$((SLURM_ARRAY_TASK_ID+1))p" {})"'.format(shlex.quote(run_locations_file))
+
+        batch_scripts = set()
+        for breeder in breeders:
+            breeder._prepare_run_location()
+            batch_scripts.add(breeder._get_batch_script(run_location=task_run_location))
+        if len(batch_scripts) > 1:
+            error_message = 'All jobs in an array must have the same scheduler settings, batch script template and'
+            error_message += ' calculation parameters'
+            raise KelpieBreederError(error_message)
+
+        with open(run_locations_file, 'w') as fw:
+            fw.write('\n'.join([os.path.abspath(breeder.run_location) for breeder in breeders]) + '\n')
+
+        batch_script_file = os.path.join(array_location, breeders[0].scheduler_script_name)
+        with open(batch_script_file, 'w') as fw:
+            fw.write(batch_scripts.pop())
+        return batch_script_file
+
+    @staticmethod
+    def submit_many(breeders, array_location, wait=False):
+        """Breed all the `breeders` and submit them to the scheduler as a single SLURM job array, instead of one
+        `sbatch` call per breeder. The `job_id` of the i-th breeder is set to that of the i-th task in the array.
+
+        :param breeders: List of `KelpieBreeder` objects (see `write_array_batch_script()`).
+        :param array_location: String with the location to write the job array batch script into, and submit from.
+        :param wait: Boolean specifying whether to block until all the jobs in the array finish ("sbatch --wait").
+                     (Default: False)
+        :return: `subprocess.CompletedProcess` for the submit command
+        :raise KelpieBreederError: if `breeders` is empty, or if the submit command for the batch scheduler is not
+                                   "sbatch"
+        """
+        if not breeders:
+            error_message = 'No breeders specified for the job array'
+            raise KelpieBreederError(error_message)
+        settings = breeders[0]._get_scheduler_settings()
+        submit_cmd = settings.get('submit_cmd')
+        if not submit_cmd or os.path.basename(submit_cmd) != 'sbatch':
+            error_message = 'Job arrays can currently only be submitted to SLURM (sbatch)'
+            raise KelpieBreederError(error_message)
 
+        batch_script_file = KelpieBreeder.write_array_batch_script(breeders, array_location)
+
+        submit_args = [submit_cmd, '--parsable', '--array=0-{}'.format(len(breeders)-1)]
+        # a separate output file for every task in the array
+        output = settings.get('output')
+        if output:
+            submit_args.append('--output={}_%a{}'.format(*os.path.splitext(output)))
+        if wait:
+            submit_args.append('--wait')
+        submit_args.append(os.path.basename(batch_script_file))
+
+        with files_and_folders.change_working_dir(os.path.dirname(batch_script_file)):
+            submission = subprocess.run(submit_args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if submission.returncode == 0:
+            array_job_id = submission.stdout.decode().strip().split(';')[0]
+            for i, breeder in enumerate(breeders):
+                breeder.job_id = '{}_{}'.format(array_job_id, i)
+        return submission
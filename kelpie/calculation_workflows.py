@@ -8,7 +8,6 @@ from kelpie.structure import Structure
 from kelpie import files_and_folders
 from kelpie.vasp_settings.incar import DEFAULT_VASP_INCAR_SETTINGS
 from kelpie.vasp_input_generator import VaspInputGenerator
-from kelpie.vasp_calculation_data import VaspCalculationData
 
 
 class KelpieWorkflowError(Exception):
@@ -94,6 +93,15 @@ class GenericWorkflow(object):
             raise KelpieWorkflowError(msg)
         self._mpi_call = mpi_call
 
+    def get_calculation_settings(self, calculation_type):
+        """
+        :param calculation_type: String with one of the calculation types in `DEFAULT_VASP_INCAR_SETTINGS`
+        :return: Dictionary with the default settings for `calculation_type`, updated with the custom settings
+                 specified for it, if any (a new dictionary; the defaults are never modified)
+        """
+        return {**DEFAULT_VASP_INCAR_SETTINGS[calculation_type],
+                **self.custom_calculation_settings.get(calculation_type, {})}
+
     @staticmethod
     def run_vasp(mpi_call):
         with open('stdout.txt', 'w') as fstdout, open('stderr.txt', 'w') as fstderr:
@@ -201,11 +209,12 @@ class GenericWorkflow(object):
             raise KelpieWorkflowError(msg)
         # increase "n_attempts": the number of VASP runs
         kwargs['n_attempts'] += 1
-        # parse VASP output files to check for convergence
+        # parse VASP output files to check for convergence (the parser, with lxml, is only needed after VASP runs)
+        from kelpie.vasp_calculation_data import VaspCalculationData
         vcd = VaspCalculationData(vasprunxml_file='vasprun.xml',
                                   vasp_outcar_file='OUTCAR')
-        converged = vcd.is_fully_converged(scf_thresh=settings.get('ediff'),
-                                           force_thresh=settings.get('ediffg'))
+        converged = vcd.is_fully_converged(scf_thresh=ig.calculation_settings.get('ediff'),
+                                           force_thresh=ig.calculation_settings.get('ediffg'))
         # if the calculation has converged or the maximum number of attempts
         # has been reached, return the most recent calculation data
         max_nattempts = kwargs.get('max_nattempts', 5)
@@ -220,7 +229,7 @@ class GenericWorkflow(object):
             vasp_errors.add('bands')
         # try to address any errors encountered above
         # except when VASP didn't run at all: request user intervention
-        if any([e in vasp_errors for e in ['empty_stdout', 'input_error']]):
+        if any(e in vasp_errors for e in ['empty_stdout', 'input_error']):
             msg = 'Error running VASP. Problem with the INCAR?'
             raise KelpieWorkflowError(msg)
         new_sett = self.address_vasp_errors(errors=vasp_errors,
@@ -274,10 +283,11 @@ class GenericWorkflow(object):
             raise KelpieWorkflowError(msg)
         # increase "n_attempts": the number of VASP runs
         kwargs['n_attempts'] += 1
-        # parse VASP output files to check for convergence
+        # parse VASP output files to check for convergence (the parser, with lxml, is only needed after VASP runs)
+        from kelpie.vasp_calculation_data import VaspCalculationData
         vcd = VaspCalculationData(vasprunxml_file='vasprun.xml',
                                   vasp_outcar_file='OUTCAR')
-        converged = vcd.is_fully_converged(scf_thresh=settings.get('ediff'))
+        converged = vcd.is_fully_converged(scf_thresh=ig.calculation_settings.get('ediff'))
         # if the calculation has converged or the maximum number of attempts
         # has been reached, return the most recent calculation data
         max_nattempts = kwargs.get('max_nattempts', 2)
@@ -292,7 +302,7 @@ class GenericWorkflow(object):
             vasp_errors.add('bands')
         # try to address any errors encountered above
         # except when VASP didn't run at all: request user intervention
-        if any([e in vasp_errors for e in ['empty_stdout', 'input_error']]):
+        if any(e in vasp_errors for e in ['empty_stdout', 'input_error']):
             msg = 'Error running VASP. Problem with the INCAR?'
             raise KelpieWorkflowError(msg)
         new_sett = self.address_vasp_errors(errors=vasp_errors,
@@ -329,8 +339,7 @@ class RelaxationWorkflow(GenericWorkflow):
             shutil.rmtree(relaxation_dir)
         # create a "relaxation" folder, if one doesn't already exist
         os.makedirs(relaxation_dir, exist_ok=True)
-        relaxation_settings = DEFAULT_VASP_INCAR_SETTINGS['relaxation']
-        relaxation_settings.update(self.custom_calculation_settings.get('relaxation', {}))
+        relaxation_settings = self.get_calculation_settings('relaxation')
         initial_structure = self.initial_structure
         with files_and_folders.change_working_dir(relaxation_dir):
             if not from_scratch:
@@ -358,8 +367,7 @@ class RelaxationWorkflow(GenericWorkflow):
         initial_structure = io.read_poscar(relaxation_output_structure)
         static_dir = os.path.join(self.run_location, 'static')
         os.makedirs(static_dir, exist_ok=True)
-        static_settings = DEFAULT_VASP_INCAR_SETTINGS['static']
-        static_settings.update(self.custom_calculation_settings.get('static', {}))
+        static_settings = self.get_calculation_settings('static')
         files_and_folders.copy_files(src_folder='relaxation',
                                      dest_folder='static',
                                      list_of_filenames=['CHGCAR'])
@@ -402,8 +410,7 @@ class AccStdRelaxWorkflow(GenericWorkflow):
         ##    shutil.rmtree(relaxation_dir)
         ### create a "relaxation" folder, if one doesn't already exist
         ##os.makedirs(relaxation_dir, exist_ok=True)
-        relaxation_settings = DEFAULT_VASP_INCAR_SETTINGS['acc_std_relax']
-        relaxation_settings.update(self.custom_calculation_settings.get('acc_std_relax', {}))
+        relaxation_settings = self.get_calculation_settings('acc_std_relax')
         initial_structure = self.initial_structure
         with files_and_folders.change_working_dir(relaxation_dir):
             if not from_scratch:
@@ -446,8 +453,7 @@ class ScForcesWorkflow(GenericWorkflow):
 
     def perform_workflow(self, from_scratch=False):
         calc_dir = os.path.join(self.run_location)
-        calc_settings = DEFAULT_VASP_INCAR_SETTINGS['sc_forces']
-        calc_settings.update(self.custom_calculation_settings.get('sc_forces', {}))
+        calc_settings = self.get_calculation_settings('sc_forces')
         initial_structure = self.initial_structure
         with files_and_folders.change_working_dir(calc_dir):
             if not from_scratch:
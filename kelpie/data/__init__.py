@@ -1,5 +1,5 @@
-import json
 import os
+from kelpie.utils.serialization import load_json
 
 # GLOBAL data
 
@@ -9,12 +9,13 @@ import os
 # Sansonetti et al., Handbook of Basic Atomic Spectroscopic Data (version 1.1.3). NIST, Gaithersburg, MD
 # Accessed from http://physics.nist.gov/Handbook [Date: Dec 27, 2017]
 atomic_weights_file = os.path.join(os.path.dirname(__file__), 'standard_atomic_weights.json')
-with open(atomic_weights_file, 'r') as fr:
-    STD_ATOMIC_WEIGHTS = json.load(fr)
+STD_ATOMIC_WEIGHTS = load_json(atomic_weights_file)
+
+# Symbols of all the elements, as a tuple so that `str.startswith(ELEMENT_SYMBOLS)` checks them all in one call
+ELEMENT_SYMBOLS = tuple(STD_ATOMIC_WEIGHTS)
 
 
 # Number of electrons in s, p, d, f shells
 # Source: OQMD (for which the data was taken from Mathematica, IIRC)
 valence_electrons_file = os.path.join(os.path.dirname(__file__), 'valence_electrons.json')
-with open(valence_electrons_file, 'r') as fr:
-    VALENCE_ELECTRONS = json.load(fr)
+VALENCE_ELECTRONS = load_json(valence_electrons_file)
@@ -101,7 +101,7 @@ class DOS(object):
     def get_energies_from_xml(self):
         if not self.total_dos_data:
             return
-        return np.array([gridpoint[0] - self.fermi_energy for gridpoint in self.total_dos_data['spin_1']])
+        return np.asarray(self.total_dos_data['spin_1'])[:, 0] - self.fermi_energy
 
     def get_energies_from_doscar(self):
         raise NotImplementedError
@@ -121,7 +121,7 @@ class DOS(object):
             return
         total_dos = {}
         for spin in self.total_dos_data:
-            total_dos[spin] = np.array([gridpoint[1] for gridpoint in self.total_dos_data[spin]])
+            total_dos[spin] = np.asarray(self.total_dos_data[spin])[:, 1]
         return total_dos
 
     def get_total_dos_from_doscar(self):
@@ -142,7 +142,7 @@ class DOS(object):
             return
         total_intdos = {}
         for spin in self.total_dos_data:
-            total_intdos[spin] = np.array([gridpoint[2] for gridpoint in self.total_dos_data[spin]])
+            total_intdos[spin] = np.asarray(self.total_dos_data[spin])[:, 2]
         return total_intdos
 
     def get_total_integrated_dos_from_doscar(self):
@@ -2,7 +2,7 @@ import os
 import shutil
 import datetime
 from contextlib import contextmanager
-from kelpie.utils.serialization import jsonable
+from kelpie.utils.serialization import datetime_to_str
 
 
 @contextmanager
@@ -17,7 +17,7 @@ def change_working_dir(new_dir):
 
 def time_stamped_folder(base_name='archive'):
     now = datetime.datetime.now()
-    return '_'.join([base_name, jsonable(now)])
+    return '_'.join([base_name, datetime_to_str(now)])
 
 
 def backup_files(list_of_files=None, folder_name='archive', gzip=True):
@@ -39,7 +39,7 @@ def backup_files(list_of_files=None, folder_name='archive', gzip=True):
 
 
 def copy_files(src_folder=None, dest_folder=None, list_of_filenames=None):
-    if any([s is None for s in [src_folder, dest_folder, list_of_filenames]]):
+    if any(s is None for s in [src_folder, dest_folder, list_of_filenames]):
         return
     for fn in list_of_filenames:
         src_file = os.path.join(src_folder, fn)
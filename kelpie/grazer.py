@@ -1,7 +1,7 @@
 import os
-import json
 from kelpie import io
 from kelpie import calculation_workflows
+from kelpie.utils.serialization import load_json
 
 
 class KelpieGrazerError(Exception):
@@ -43,10 +43,10 @@ class KelpieGrazer(object):
         self._run_location = None
         self.run_location = run_location
 
-        #: File with the initial structure, and the initial structure
+        #: File with the initial structure, and the initial structure (read from the file only when first needed)
+        self._initial_structure = None
         self._initial_structure_file = None
         self.initial_structure_file = initial_structure_file
-        self.initial_structure = io.read_poscar(self.initial_structure_file)
 
         #: Type of DFT calculation workflow: relaxation/static/hse/...
         self._calculation_workflow = None
@@ -89,6 +89,13 @@ class KelpieGrazer(object):
             raise KelpieGrazerError(error_message)
         else:
             self._initial_structure_file = os.path.abspath(initial_structure_file)
+            self._initial_structure = None
+
+    @property
+    def initial_structure(self):
+        if self._initial_structure is None:
+            self._initial_structure = io.read_poscar(self.initial_structure_file)
+        return self._initial_structure
 
     @property
     def calculation_workflow(self):
@@ -116,8 +123,7 @@ class KelpieGrazer(object):
             error_message = 'Specified custom settings file {} not found'.format(custom_calculation_settings)
             raise KelpieGrazerError(error_message)
         else:
-            with open(custom_calculation_settings, 'r') as fr:
-                self._custom_calculation_settings = json.load(fr)
+            self._custom_calculation_settings = load_json(custom_calculation_settings)
 
     @property
     def mpi_call_file(self):
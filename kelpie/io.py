@@ -1,7 +1,43 @@
 import os
+import sys
+import mmap
+import itertools
+import functools
+import zipfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from kelpie.structure import Atom
 from kelpie.structure import Structure
-from kelpie.data import STD_ATOMIC_WEIGHTS
+from kelpie.data import ELEMENT_SYMBOLS
+from kelpie.utils import memoize_read_method
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+# number of coordinate lines handed to numpy at a time when streaming the atomic coordinates
+_COORDINATES_CHUNK_SIZE = 65536
+
+# size (in bytes) of the read buffer when streaming the atomic coordinates: fewer read() calls for large files
+_READ_BUFFER_SIZE = 1 << 20
+
+# POSCAR files larger than this (in bytes) are memory-mapped instead of read, when parsed with numba
+_MMAP_MIN_FILE_SIZE = 1 << 20
+
+# powers of 10 that are exactly representable as float (used by the compiled coordinates parser)
+_EXACT_POWERS_OF_10 = np.array([10.**k for k in range(23)])
+
+# marker for "Selective dynamics" on line 8, which is currently not handled
+_SELECTIVE_DYNAMICS = object()
+
+# coordinate system by the first character (lowercased) of line 8 of a POSCAR
+_COORDINATE_SYSTEMS = {'d': 'Direct', 'c': 'Cartesian', 'k': 'Cartesian', 's': _SELECTIVE_DYNAMICS}
+
+# suffix of the file next to a POSCAR in which its parsed contents are cached (see `read_poscar(use_cache=True)`)
+_POSCAR_CACHE_SUFFIX = '.parsed.npz'
 
 
 class KelpieIOError(Exception):
@@ -9,36 +45,19 @@ class KelpieIOError(Exception):
     pass
 
 
-def read_poscar(poscar_file='POSCAR'):
+def read_poscar(poscar_file='POSCAR', use_cache=False):
     """
     :param poscar_file: Location of the VASP POSCAR (version 5) file
                         NOTE: Names of all species (line 6) need to begin with the symbol of a real element.
+    :param use_cache: Boolean specifying whether to store the parsed POSCAR in a "[poscar_file].parsed.npz" file
+                      next to it, and read it from there as long as the POSCAR is not modified. Useful when the same
+                      (large) POSCAR is read repeatedly. (Default: False)
     :return: `kelpie.structure.Structure` object
     """
-    if not os.path.isfile(poscar_file):
-        error_message = 'Specified POSCAR file {} not found'.format(poscar_file)
-        raise FileNotFoundError(error_message)
-
-    with open(poscar_file, 'r') as fr:
-        poscar_lines = [line.strip() for line in fr.readlines()]
-
-    if not _consistent_number_of_atoms(poscar_lines):
-        error_message = 'Mismatch between the number of atoms (Line 7) and the number of atomic coordinates (Lines 9-)'
-        raise KelpieIOError(error_message)
-
-    poscar_blocks = ['system_title',
-                     'scaling_constant',
-                     'lattice_vectors',
-                     'list_of_species',
-                     'list_of_number_of_atoms',
-                     'repeating_list_of_species',
-                     'coordinate_system',
-                     'list_of_atomic_coordinates'
-                     ]
-
-    poscar_as_dict = {}
-    for block in poscar_blocks:
-        poscar_as_dict[block] = globals()['_{}'.format(block)](poscar_lines)
+    if use_cache:
+        poscar_as_dict = _read_cached_poscar(poscar_file)
+    else:
+        poscar_as_dict = PoscarParser(poscar_file).as_dict()
 
     s = Structure()
     s.comment = poscar_as_dict['system_title']
@@ -52,11 +71,211 @@ def read_poscar(poscar_file='POSCAR'):
     return s
 
 
-def _consistent_number_of_atoms(poscar_lines):
-    """Is the total number of atoms (Line 7) consistent with the number of atomic coordinates specified?
+def read_many_poscars(poscar_files, max_workers=None, use_cache=False):
+    """Read many POSCAR files concurrently, using a pool of threads: the file reads (and numpy's parsing of the
+    atomic coordinates, which releases the GIL) of different files overlap.
 
-    :return: Boolean """
-    return len(_repeating_list_of_species(poscar_lines)) == len(_list_of_atomic_coordinates(poscar_lines))
+    :param poscar_files: List of locations of VASP POSCAR (version 5) files
+    :param max_workers: Integer with the maximum number of threads. (Default: `ThreadPoolExecutor` default)
+    :param use_cache: Boolean passed on to `read_poscar()`. (Default: False)
+    :return: List of `kelpie.structure.Structure` objects, in the same order as `poscar_files`
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(functools.partial(read_poscar, use_cache=use_cache), poscar_files))
+
+
+class PoscarParser(object):
+    """Parse a VASP POSCAR (version 5) file block by block, on demand: each block is parsed only when it is first read,
+    and only once, e.g. reading the lattice vectors alone does not parse the atomic coordinates.
+
+    NOTE: Names of all species (line 6) need to begin with the symbol of a real element.
+    """
+
+    def __init__(self, poscar_file='POSCAR'):
+        """
+        :param poscar_file: Location of the VASP POSCAR (version 5) file
+        :raise FileNotFoundError: if `poscar_file` is not found
+        """
+        try:
+            fr = open(poscar_file, 'rb')
+        except (FileNotFoundError, IsADirectoryError):
+            error_message = 'Specified POSCAR file {} not found'.format(poscar_file)
+            raise FileNotFoundError(error_message)
+
+        #: Location of the POSCAR file
+        self.poscar_file = poscar_file
+
+        # only the header (lines 1-8) is read here; the atomic coordinates block is read if and when it is needed
+        with fr:
+            #: String with each of the (first) 8 lines of the POSCAR
+            self._header_lines = [line.decode().strip() for line in itertools.islice(fr, 8)]
+            #: position in the file where line 9 (the atomic coordinates block) starts
+            self._body_offset = fr.tell()
+            #: (device, inode, size, modification time) of the file the header was read from
+            self._file_version = _file_version(os.fstat(fr.fileno()))
+
+        #: output of the `read_*` methods that have already been called
+        self._cache = {}
+
+    @memoize_read_method
+    def read_system_title(self):
+        return _system_title(self._header_lines)
+
+    @memoize_read_method
+    def read_scaling_constant(self):
+        return _scaling_constant(self._header_lines)
+
+    @memoize_read_method
+    def read_lattice_vectors(self):
+        return _lattice_vectors(self._header_lines)
+
+    @memoize_read_method
+    def read_list_of_species(self):
+        return _list_of_species(self._header_lines)
+
+    @memoize_read_method
+    def read_list_of_number_of_atoms(self):
+        return _list_of_number_of_atoms(self._header_lines)
+
+    @memoize_read_method
+    def read_number_of_atoms(self):
+        """:return: Integer with the total number of atoms in the structure"""
+        return sum(self.read_list_of_number_of_atoms())
+
+    @memoize_read_method
+    def read_coordinate_system(self):
+        return _coordinate_system(self._header_lines)
+
+    @memoize_read_method
+    def read_repeating_list_of_species(self):
+        return _repeat_species(self.read_list_of_species(), self.read_list_of_number_of_atoms())
+
+    @memoize_read_method
+    def read_list_of_atomic_coordinates(self):
+        """
+        :return: Nx3-shaped numpy.ndarray of Float with the atomic coordinates
+        :raise KelpieIOError: if any atomic coordinate component cannot be converted to float, if the number of
+                              atomic coordinates does not match the number of atoms (Line 7), or if the POSCAR file
+                              has changed since its header was read
+        """
+        n_atoms = self.read_number_of_atoms()
+        with open(self.poscar_file, 'rb', buffering=_READ_BUFFER_SIZE) as fr:
+            # the file is opened again: make sure that the header and the coordinates come from the same file
+            # (e.g. not from a CONTCAR that was rewritten in between)
+            stat = os.fstat(fr.fileno())
+            if _file_version(stat) != self._file_version:
+                error_message = 'POSCAR file {} changed after its header was read'.format(self.poscar_file)
+                raise KelpieIOError(error_message)
+            if numba is None:
+                # stream the lines (as bytes) straight from the file into numpy, without holding all of them in memory
+                fr.seek(self._body_offset)
+                atomic_coordinates = _read_atomic_coordinates(fr, n_atoms)
+            elif stat.st_size > _MMAP_MIN_FILE_SIZE:
+                # map large files into memory, and let the compiled parser read the pages in place (no copy)
+                with mmap.mmap(fr.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    atomic_coordinates = _read_atomic_coordinates_buffer(mm, n_atoms, offset=self._body_offset)
+            else:
+                fr.seek(self._body_offset)
+                atomic_coordinates = _read_atomic_coordinates_buffer(fr.read(), n_atoms)
+        if len(atomic_coordinates) != n_atoms:
+            error_message = 'Mismatch between the number of atoms (Line 7) and the number of atomic coordinates'
+            error_message += ' (Lines 9-)'
+            raise KelpieIOError(error_message)
+        return atomic_coordinates
+
+    @memoize_read_method
+    def read_atomic_coordinates_by_axis(self):
+        """
+        :return: Tuple of 3 contiguous numpy.ndarray of Float with all the x, all the y, and all the z coordinates of
+                 the atoms, for operations along one axis at a time (e.g. `x.min()`) that would otherwise stride over
+                 the Nx3 array
+        """
+        return tuple(np.ascontiguousarray(self.read_list_of_atomic_coordinates().T))
+
+    def as_dict(self):
+        """
+        :return: Dictionary with all the blocks of the POSCAR, e.g. "lattice_vectors", "list_of_atomic_coordinates"
+        :raise KelpieIOError: if any of the blocks cannot be parsed
+        """
+        poscar_blocks = ['system_title',
+                         'scaling_constant',
+                         'lattice_vectors',
+                         'list_of_species',
+                         'list_of_number_of_atoms',
+                         'coordinate_system',
+                         'repeating_list_of_species',
+                         'list_of_atomic_coordinates',
+                         ]
+        return dict([(block, getattr(self, 'read_{}'.format(block))()) for block in poscar_blocks])
+
+
+def _file_version(stat):
+    """:return: Tuple of (device, inode, size, modification time) from the `os.stat_result` of a file"""
+    return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def _read_cached_poscar(poscar_file):
+    """
+    Same as `PoscarParser(poscar_file).as_dict()`, but the result is stored in "[poscar_file].parsed.npz" along with
+    the modification time and size of the POSCAR, and read from there (instead of parsing the POSCAR again) while they
+    are unchanged.
+    If the cache cannot be read or written (e.g. a read-only file system), the POSCAR is simply parsed.
+
+    :param poscar_file: Location of the VASP POSCAR (version 5) file
+    :return: Dictionary with all the blocks of the POSCAR (see `PoscarParser.as_dict()`)
+    """
+    try:
+        stat = os.stat(poscar_file)
+    except OSError:
+        return PoscarParser(poscar_file).as_dict()
+
+    cache_file = '{}{}'.format(poscar_file, _POSCAR_CACHE_SUFFIX)
+    try:
+        with np.load(cache_file) as cached:
+            if int(cached['mtime_ns']) == stat.st_mtime_ns and int(cached['size']) == stat.st_size:
+                poscar_as_dict = {'system_title': str(cached['system_title']),
+                                  'scaling_constant': float(cached['scaling_constant']),
+                                  'lattice_vectors': cached['lattice_vectors'].tolist(),
+                                  'list_of_species': [sys.intern(species)
+                                                      for species in cached['list_of_species'].tolist()],
+                                  'list_of_number_of_atoms': cached['list_of_number_of_atoms'].tolist(),
+                                  'coordinate_system': str(cached['coordinate_system']),
+                                  'list_of_atomic_coordinates': cached['list_of_atomic_coordinates'],
+                                  }
+                poscar_as_dict['repeating_list_of_species'] = _repeat_species(
+                    poscar_as_dict['list_of_species'], poscar_as_dict['list_of_number_of_atoms'])
+                return poscar_as_dict
+    except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+        # missing, truncated or corrupt cache
+        pass
+
+    poscar_as_dict = PoscarParser(poscar_file).as_dict()
+    # write to a temporary file first (unique to this writer, be it another process or another thread), so that a
+    # concurrent reader never sees a partially written cache
+    try:
+        fd, tmp_cache_file = tempfile.mkstemp(prefix=os.path.basename(cache_file), suffix='.tmp',
+                                              dir=os.path.dirname(os.path.abspath(cache_file)))
+    except OSError:
+        return poscar_as_dict
+    try:
+        with os.fdopen(fd, 'wb') as fw:
+            np.savez(fw,
+                     mtime_ns=stat.st_mtime_ns,
+                     size=stat.st_size,
+                     system_title=poscar_as_dict['system_title'],
+                     scaling_constant=poscar_as_dict['scaling_constant'],
+                     lattice_vectors=poscar_as_dict['lattice_vectors'],
+                     list_of_species=poscar_as_dict['list_of_species'],
+                     list_of_number_of_atoms=poscar_as_dict['list_of_number_of_atoms'],
+                     coordinate_system=poscar_as_dict['coordinate_system'],
+                     list_of_atomic_coordinates=poscar_as_dict['list_of_atomic_coordinates'])
+        # `mkstemp` creates the file readable only by the owner: give the cache the permissions of the POSCAR instead
+        os.chmod(tmp_cache_file, stat.st_mode & 0o666)
+        os.replace(tmp_cache_file, cache_file)
+    except OSError:
+        if os.path.exists(tmp_cache_file):
+            os.remove(tmp_cache_file)
+    return poscar_as_dict
 
 
 def _system_title(poscar_lines):
@@ -86,26 +305,25 @@ def _lattice_vectors(poscar_lines):
     :return: 3x3-shaped List of Float with the lattice vectors [[a11, a12, a13], [a21, a22, a23], ...]
     :raise KelpieIOError: if any lattice vector component cannot be converted to float
     """
-    lattice_vectors = []
     try:
-        for line in poscar_lines[2:5]:
-            lattice_vectors.append([float(a) for a in line.split()])
+        lattice_vectors = np.array(' '.join(poscar_lines[2:5]).split(), dtype=float).reshape(3, 3)
     except ValueError:
         error_message = 'Lattice vector components (Lines 3-5) should be floating point'
         raise KelpieIOError(error_message)
     else:
-        return lattice_vectors
+        return lattice_vectors.tolist()
 
 
 def _list_of_species(poscar_lines):
     """Parse the species in the structure (line 6).
 
-    :return: List of String with the species symbols
+    :return: List of String with the species symbols (interned, so that the many structures read in one process all
+             share a single copy of each species name)
     :raise KelpieIOError: if any of the species names contains only integers
     """
-    species_list = poscar_lines[5].split()
+    species_list = [sys.intern(species) for species in poscar_lines[5].split()]
     for species in species_list:
-        if not any([species.startswith(e) for e in STD_ATOMIC_WEIGHTS]):
+        if not species.startswith(ELEMENT_SYMBOLS):
             error_message = 'All species names (Line 6) must begin with the symbol of a real element.'
             error_message += '\nNOTE: Only VASP 5 POSCAR format is supported'
             raise KelpieIOError(error_message)
@@ -119,7 +337,7 @@ def _list_of_number_of_atoms(poscar_lines):
     :raise KelpieIOError: if any of the number of atoms cannot be converted to int
     """
     try:
-        list_of_number_of_atoms = [int(n) for n in poscar_lines[6].split()]
+        list_of_number_of_atoms = list(map(int, poscar_lines[6].split()))
     except ValueError:
         error_message = 'Number of atoms of each species (Line 7) should be integers'
         raise KelpieIOError(error_message)
@@ -127,9 +345,10 @@ def _list_of_number_of_atoms(poscar_lines):
         return list_of_number_of_atoms
 
 
-def _repeating_list_of_species(poscar_lines):
+def _repeat_species(list_of_species, list_of_number_of_atoms):
+    """:return: List of String with the species of every atom, e.g. ["Li", "Li", "O"] for ["Li", "O"], [2, 1]"""
     repeating_list_of_species = []
-    for s, n in zip(_list_of_species(poscar_lines), _list_of_number_of_atoms(poscar_lines)):
+    for s, n in zip(list_of_species, list_of_number_of_atoms):
         repeating_list_of_species += [s]*n
     return repeating_list_of_species
 
@@ -142,38 +361,201 @@ def _coordinate_system(poscar_lines):
     :raise NotImplementedError: for Selective Dynamics
     :raise KelpieIOError: if coordinate system is not VASP-recognizable
     """
-    coordinate_system = poscar_lines[7]
-    first_char = coordinate_system.lower()[0]  # VASP only recognizes the first character
-    if first_char == 'd':
-        return 'Direct'
-    elif first_char in ['c', 'k']:
-        return 'Cartesian'
-    elif first_char == 's':
-        error_message = 'Selective dynamics I/O handling currently not implemented'
-        raise NotImplementedError(error_message)
-    else:
+    # VASP only recognizes the first character
+    coordinate_system = _COORDINATE_SYSTEMS.get(poscar_lines[7][:1].lower())
+    if coordinate_system is None:
         error_message = 'Coordinate system (Line 8) can only be direct or cartesian'
         raise KelpieIOError(error_message)
+    elif coordinate_system is _SELECTIVE_DYNAMICS:
+        error_message = 'Selective dynamics I/O handling currently not implemented'
+        raise NotImplementedError(error_message)
+    return coordinate_system
 
 
 def _list_of_atomic_coordinates(poscar_lines):
     """
     Parse all the atomic coordinates (line 9-(9+number of atoms)).
 
-    :return: Nx3-shaped List of Float with the atomic coordinates [[c11, c12, c13], [c21, c22, c23], ...]
+    :return: Nx3-shaped numpy.ndarray of Float with the atomic coordinates [[c11, c12, c13], [c21, c22, c23], ...]
     :raise KelpieIOError: if any atomic coordinate component cannot be converted to float
     """
-    atomic_coordinates = []
-    for i, line in enumerate(poscar_lines[8:]):
-        if line[0] == '#':
-            break
-        try:
-            coord = [float(c) for c in line.split()[:3]]
-        except ValueError:
-            error_message = 'Check the atomic coordinates block (Line {}) for non-float values'.format(9+i)
-            raise KelpieIOError(error_message)
-        else:
-            atomic_coordinates.append(coord)
-        if i == sum(_list_of_number_of_atoms(poscar_lines))-1:
+    n_atoms = sum(_list_of_number_of_atoms(poscar_lines))
+    return _read_atomic_coordinates(poscar_lines[8:], n_atoms)
+
+
+def _read_atomic_coordinates(lines, n_atoms):
+    """
+    Parse the atomic coordinates block from an iterable of lines (e.g. an open POSCAR file positioned at line 9).
+    At most `n_atoms` lines are consumed; blank lines and comments ("#") among them are skipped by numpy's tokenizer
+    (so that a block cut short by them has fewer than `n_atoms` coordinates).
+
+    :param lines: Iterable of String or Bytes with the lines of the POSCAR starting from line 9
+    :param n_atoms: Integer with the total number of atoms in the structure
+    :return: Nx3-shaped numpy.ndarray of Float with the atomic coordinates, N <= `n_atoms`
+    :raise KelpieIOError: if any atomic coordinate component cannot be converted to float
+    """
+    coordinate_lines = itertools.islice(lines, n_atoms)
+    atomic_coordinates = np.empty((n_atoms, 3))
+    n_read = 0
+    first_line_number = 9
+    while True:
+        chunk = list(itertools.islice(coordinate_lines, _COORDINATES_CHUNK_SIZE))
+        if not chunk:
             break
+        coordinates = _parse_coordinate_lines(chunk, first_line_number=first_line_number)
+        atomic_coordinates[n_read:n_read+len(coordinates)] = coordinates
+        n_read += len(coordinates)
+        first_line_number += len(chunk)
+    return atomic_coordinates[:n_read]
+
+
+def _parse_coordinate_lines(coordinate_lines, first_line_number=9):
+    """
+    :param coordinate_lines: List of String or Bytes with lines of the atomic coordinates block
+    :param first_line_number: Integer with the line number of the first line in the POSCAR (used in error messages)
+    :return: Nx3-shaped numpy.ndarray of Float with the atomic coordinates
+    :raise KelpieIOError: if any atomic coordinate component cannot be converted to float
+    """
+    # numpy warns about lines with no data at all (only blank lines and comments): there are no coordinates in them
+    # (usually stops at the first line)
+    if not any(_is_coordinate_line(line) for line in coordinate_lines):
+        return np.empty((0, 3))
+    try:
+        # a single call into numpy's C parser; any trailing flags/labels after the 3 coordinates are ignored
+        return np.loadtxt(coordinate_lines, usecols=(0, 1, 2), ndmin=2)
+    except ValueError:
+        # go through the lines one-by-one only to point at the offending line
+        for i, line in enumerate(coordinate_lines):
+            if not _is_coordinate_line(line):
+                continue
+            fields = line.split()
+            try:
+                coord = [float(c) for c in fields[:3]]
+            except ValueError:
+                coord = []
+            if len(coord) != 3:
+                error_message = 'Check the atomic coordinates block (Line {}) for non-float values'.format(
+                    first_line_number+i)
+                raise KelpieIOError(error_message)
+        raise
+
+
+def _is_coordinate_line(line):
+    """:return: False if `line` (String or Bytes) is blank or a comment, True otherwise"""
+    fields = line.split(None, 1)
+    return bool(fields) and fields[0][:1] not in ['#', b'#']
+
+
+def _read_atomic_coordinates_buffer(buffer, n_atoms, offset=0):
+    """
+    Parse the atomic coordinates block from the raw bytes of the POSCAR starting from line 9 using the compiled
+    `_parse_coordinates_buffer`. Falls back to `_read_atomic_coordinates` for anything that the compiled parser does
+    not handle exactly (non-float values, more than 15 significant digits, large exponents).
+
+    :param buffer: Bytes (or `mmap.mmap`) with the contents of the POSCAR starting from line 9 (from `offset`)
+    :param n_atoms: Integer with the total number of atoms in the structure
+    :param offset: Integer with the position in `buffer` where line 9 starts. (Default: 0)
+    :return: Nx3-shaped numpy.ndarray of Float with the atomic coordinates, N <= `n_atoms`
+    :raise KelpieIOError: if any atomic coordinate component cannot be converted to float
+    """
+    atomic_coordinates, parsed = _parse_coordinates_buffer(np.frombuffer(buffer, dtype=np.uint8, offset=offset),
+                                                           n_atoms, _EXACT_POWERS_OF_10)
+    if not parsed:
+        return _read_atomic_coordinates(buffer[offset:].decode().splitlines(), n_atoms)
     return atomic_coordinates
+
+
+def _parse_coordinates_buffer(buffer, n_atoms, powers_of_10):
+    """
+    Parse the first 3 columns of at most `n_atoms` lines in `buffer`, stopping early at a blank line or a comment.
+    Compiled with numba when it is available.
+
+    Each value is read as an integer mantissa and a power of 10, and converted with a single multiplication or
+    division, which is exact (correctly rounded) for up to 15 significant digits and powers of 10 up to 22.
+    Trailing zeros go into the power of 10, so that e.g. "12.50000000000000" is read as 125 x 10^-1.
+
+    :param buffer: numpy.ndarray of uint8 with the bytes of the coordinates block
+    :param n_atoms: Integer with the total number of atoms in the structure
+    :param powers_of_10: numpy.ndarray of Float with the powers of 10 from 10^0 to 10^22
+    :return: (Nx3-shaped numpy.ndarray of Float with the atomic coordinates, Boolean) where the Boolean is False if
+             any value could not be parsed exactly
+    """
+    atomic_coordinates = np.empty((n_atoms, 3))
+    size = len(buffer)
+    pos = 0
+    row = 0
+    while row < n_atoms and pos < size:
+        # a blank line or a comment ("#") ends the block
+        while pos < size and (buffer[pos] == 32 or buffer[pos] == 9):
+            pos += 1
+        if pos >= size or buffer[pos] == 10 or buffer[pos] == 13 or buffer[pos] == 35:
+            break
+        for col in range(3):
+            while pos < size and (buffer[pos] == 32 or buffer[pos] == 9):
+                pos += 1
+            sign = 1.
+            if pos < size and (buffer[pos] == 45 or buffer[pos] == 43):
+                if buffer[pos] == 45:
+                    sign = -1.
+                pos += 1
+            mantissa = 0
+            n_digits = 0
+            n_significant_digits = 0
+            n_trailing_zeros = 0
+            n_decimals = 0
+            decimal_point = False
+            while pos < size:
+                c = int(buffer[pos])
+                if 48 <= c <= 57:
+                    n_digits += 1
+                    if c != 48:
+                        # zeros are significant only once a nonzero digit follows them
+                        n_significant_digits += n_trailing_zeros + 1
+                        if n_significant_digits <= 15:
+                            for _ in range(n_trailing_zeros + 1):
+                                mantissa *= 10
+                            mantissa += c - 48
+                        n_trailing_zeros = 0
+                    elif mantissa > 0:
+                        n_trailing_zeros += 1
+                    if decimal_point:
+                        n_decimals += 1
+                elif c == 46 and not decimal_point:
+                    decimal_point = True
+                else:
+                    break
+                pos += 1
+            exponent = 0
+            if n_digits > 0 and pos < size and (buffer[pos] == 69 or buffer[pos] == 101):
+                pos += 1
+                exponent_sign = 1
+                if pos < size and (buffer[pos] == 45 or buffer[pos] == 43):
+                    if buffer[pos] == 45:
+                        exponent_sign = -1
+                    pos += 1
+                n_exponent_digits = 0
+                while pos < size and 48 <= buffer[pos] <= 57:
+                    exponent = exponent*10 + (int(buffer[pos]) - 48)
+                    n_exponent_digits += 1
+                    pos += 1
+                if n_exponent_digits == 0:
+                    n_digits = 0
+                exponent *= exponent_sign
+            exponent += n_trailing_zeros - n_decimals
+            end_of_value = pos >= size or buffer[pos] in (9, 10, 13, 32)
+            if not end_of_value or n_digits == 0 or n_significant_digits > 15 or abs(exponent) > 22:
+                return atomic_coordinates[:row], False
+            if exponent < 0:
+                atomic_coordinates[row, col] = sign*mantissa/powers_of_10[-exponent]
+            else:
+                atomic_coordinates[row, col] = sign*mantissa*powers_of_10[exponent]
+        # skip any selective dynamics flags, labels, etc. till the end of the line
+        while pos < size and buffer[pos] != 10:
+            pos += 1
+        pos += 1
+        row += 1
+    return atomic_coordinates[:row], True
+
+
+if numba is not None:
+    _parse_coordinates_buffer = numba.njit(cache=True)(_parse_coordinates_buffer)
@@ -1,6 +1,6 @@
 import os
 import glob
-import json
+from kelpie.utils.serialization import load_json
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 host_setting_files = glob.glob(os.path.join(current_dir, '*.json'))
@@ -9,5 +9,4 @@ host_setting_files = glob.glob(os.path.join(current_dir, '*.json'))
 DEFAULT_SCHEDULER_SETTINGS = {}
 for host_setting_file in host_setting_files:
     host_tag = os.path.splitext(os.path.basename(host_setting_file))[0]
-    with open(host_setting_file, 'r') as fr:
-        DEFAULT_SCHEDULER_SETTINGS[host_tag] = json.load(fr)
+    DEFAULT_SCHEDULER_SETTINGS[host_tag] = load_json(host_setting_file)
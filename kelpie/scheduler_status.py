@@ -0,0 +1,120 @@
+import os
+import time
+import subprocess
+
+
+#: states of SLURM jobs that have finished, and will not change anymore
+SLURM_TERMINAL_STATES = frozenset(['BOOT_FAIL', 'CANCELLED', 'COMPLETED', 'DEADLINE', 'FAILED', 'NODE_FAIL',
+                                   'OUT_OF_MEMORY', 'PREEMPTED', 'REVOKED', 'TIMEOUT'])
+
+
+class SchedulerStatusError(Exception):
+    """Base class to handle errors associated with querying the batch scheduler."""
+    pass
+
+
+class SlurmStatusCache(object):
+    """Process-wide cache of the states of SLURM jobs.
+
+    All the jobs of the current user are listed with a single `squeue` call, refreshed at most once every `max_age`
+    seconds, so that querying the state of N jobs does not hit the SLURM controller N times. Jobs that are no longer
+    in the queue are looked up with `sacct` once, and their final state is remembered.
+    """
+
+    def __init__(self, max_age=30):
+        """Constructor.
+
+        :param max_age: Float with the number of seconds after which the `squeue` listing is refreshed.
+                        (Default: 30)
+        """
+        #: Maximum age (in seconds) of the `squeue` listing before it is refreshed.
+        self.max_age = max_age
+
+        #: Dictionary of job ID -> state of all the jobs in the queue, as of the last refresh.
+        self._queued_states = {}
+
+        #: Time (`time.monotonic()`) of the last refresh.
+        self._last_refresh = None
+
+        #: Dictionary of job ID -> final state of the jobs that have finished (as reported by `sacct`).
+        self._final_states = {}
+
+    @staticmethod
+    def _parse_squeue_output(squeue_output):
+        """:return: Dictionary of job ID -> state from the output of `squeue -h -r -o '%i %T'`"""
+        states = {}
+        for line in squeue_output.splitlines():
+            fields = line.split()
+            if len(fields) >= 2:
+                states[fields[0]] = fields[1]
+        return states
+
+    def refresh(self):
+        """List the states of all the jobs of the current user with a single `squeue` call.
+
+        Every task of a job array is listed on a line of its own ("-r"), instead of the pending tasks being collapsed
+        into a single "12345_[0-9]" line.
+
+        :raise SchedulerStatusError: if `squeue` cannot be run, or fails
+        """
+        squeue_cmd = ['squeue', '-h', '-r', '-o', '%i %T']
+        user = os.environ.get('USER')
+        if user:
+            squeue_cmd += ['-u', user]
+        try:
+            squeue = subprocess.run(squeue_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                    universal_newlines=True)
+        except OSError as e:
+            error_message = 'Failed to run squeue: {}'.format(e)
+            raise SchedulerStatusError(error_message)
+        if squeue.returncode != 0:
+            error_message = 'Failed to query the job queue: {}'.format(squeue.stderr.strip())
+            raise SchedulerStatusError(error_message)
+        self._queued_states = self._parse_squeue_output(squeue.stdout)
+        self._last_refresh = time.monotonic()
+
+    @staticmethod
+    def _query_sacct(job_id):
+        """
+        :return: String with the state of the job `job_id` as reported by `sacct` (None if unknown)
+        :raise SchedulerStatusError: if `sacct` cannot be run
+        """
+        sacct_cmd = ['sacct', '-n', '-X', '-P', '-o', 'State', '-j', str(job_id)]
+        try:
+            sacct = subprocess.run(sacct_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        except OSError as e:
+            error_message = 'Failed to run sacct: {}'.format(e)
+            raise SchedulerStatusError(error_message)
+        states = sacct.stdout.split()
+        # e.g. "CANCELLED by 12345"
+        return states[0] if states else None
+
+    def get(self, job_id, max_age=None):
+        """
+        :param job_id: String/Integer with the SLURM job ID (e.g. "12345" or "12345_7" for an array task)
+        :param max_age: Float with the maximum age (in seconds) of the `squeue` listing that is acceptable for this
+                        query. (Default: `self.max_age`)
+        :return: String with the state of the job, e.g. "PENDING", "RUNNING", "COMPLETED" (None if unknown)
+        :raise SchedulerStatusError: if `squeue` or `sacct` cannot be run, or `squeue` fails
+        """
+        job_id = str(job_id)
+        if job_id in self._final_states:
+            return self._final_states[job_id]
+
+        if max_age is None:
+            max_age = self.max_age
+        if self._last_refresh is None or time.monotonic() - self._last_refresh > max_age:
+            self.refresh()
+        if job_id in self._queued_states:
+            return self._queued_states[job_id]
+
+        # job is not in the (possibly stale) listing: ask `sacct`, and remember the state only once the job has finished
+        # (e.g. a job submitted after the last refresh is not finished)
+        state = self._query_sacct(job_id)
+        if state in SLURM_TERMINAL_STATES:
+            self._final_states[job_id] = state
+        return state
+
+
+# module variable SLURM_STATUS_CACHE shared by all the jobs submitted from this process
+SLURM_STATUS_CACHE = SlurmStatusCache()
@@ -1,6 +1,10 @@
 import numpy
 from collections import defaultdict
-from kelpie.data import STD_ATOMIC_WEIGHTS
+from kelpie.data import ELEMENT_SYMBOLS
+
+
+# format of a lattice vector or atomic coordinates line in a POSCAR, parsed once
+_format_poscar_vector = '  '.join(['{:>18.14f}']*3).format
 
 
 class AtomError(Exception):
@@ -47,10 +51,10 @@ class Atom(object):
             if numpy.shape(coord) != (3,):
                 error_message = 'coordinates must be a 1x3-shaped iterable'
                 raise AtomError(error_message)
-            for i in range(3):
-                if numpy.isnan(coord[i]):
-                    error_message = 'Atom coordinate ({}) is None'.format(i)
-                    raise AtomError(error_message)
+            # a single vectorized check; the index is looked up only to report the error
+            if numpy.isnan(coord).any():
+                error_message = 'Atom coordinate ({}) is None'.format(numpy.flatnonzero(numpy.isnan(coord))[0])
+                raise AtomError(error_message)
         self._coordinates = coord.tolist()
 
     @property
@@ -63,7 +67,7 @@ class Atom(object):
             error_message = 'Atomic species at the site must be specified'
             raise AtomError(error_message)
         try:
-            if not any([species.startswith(e) for e in STD_ATOMIC_WEIGHTS]):
+            if not species.startswith(ELEMENT_SYMBOLS):
                 error_message = 'Species label must start with a known element symbol'
                 raise AtomError(error_message)
         except AttributeError:
@@ -174,11 +178,10 @@ class Structure(object):
             if numpy.shape(lv) != (3, 3):
                 error_message = '`lattice_vectors` must be a 3x3-shaped iterable'
                 raise StructureError(error_message)
-            for i in range(3):
-                for j in range(3):
-                    if numpy.isnan(lv[i][j]):
-                        error_message = 'Lattice vector component ({}, {}) is None'.format(i, j)
-                        raise StructureError(error_message)
+            if numpy.isnan(lv).any():
+                i, j = numpy.argwhere(numpy.isnan(lv))[0]
+                error_message = 'Lattice vector component ({}, {}) is None'.format(i, j)
+                raise StructureError(error_message)
             self._lattice_vectors = lv.tolist()
 
     @staticmethod
@@ -228,7 +231,7 @@ class Structure(object):
         if atoms is None:
             self._atoms = []
             return
-        if not all([isinstance(atom, Atom) for atom in atoms]):
+        if not all(isinstance(atom, Atom) for atom in atoms):
             error_message = '`atoms` must be an iterable of `kelpie.Atom` objects'
             raise StructureError(error_message)
         self._atoms = atoms
@@ -305,25 +308,28 @@ class Structure(object):
         :return: String with the contents of a VASP 5 POSCAR file
         """
         self.check_structure_is_complete()
+        # group the atoms by species in a single pass over the atoms
+        atoms_of_species = defaultdict(list)
+        for atom in self.atoms:
+            atoms_of_species[atom.species].append(atom)
+        list_of_species = sorted(atoms_of_species)
+
         poscar = []
         # system title
         poscar.append(self.comment)
         # scaling factor
         poscar.append('{:18.14f}'.format(self.scaling_constant))
         # lattice_vectors
-        for lv in self.lattice_vectors:
-            poscar.append('  '.join(['{:>18.14f}'.format(_lv) for _lv in lv]))
+        poscar.extend([_format_poscar_vector(*lv) for lv in self.lattice_vectors])
         # list of species
-        poscar.append(' '.join(['{:>4s}'.format(species) for species in self.list_of_species]))
+        poscar.append(' '.join(['{:>4s}'.format(species) for species in list_of_species]))
         # list of number of atoms of each species
-        poscar.append(' '.join(['{:>4d}'.format(self.composition_dict[e]) for e in self.list_of_species]))
+        poscar.append(' '.join(['{:>4d}'.format(len(atoms_of_species[e])) for e in list_of_species]))
         # coordinate system
         poscar.append('{}'.format(self.coordinate_system))
         # list of atomic coordinates
-        for species in self.list_of_species:
-            for atom in self.atoms:
-                if atom.species == species:
-                    poscar.append('  '.join(['{:>18.14f}'.format(ac) for ac in atom.coordinates]))
+        for species in list_of_species:
+            poscar.extend([_format_poscar_vector(*atom.coordinates) for atom in atoms_of_species[species]])
         return '\n'.join(poscar)
 
     @property
@@ -0,0 +1,12 @@
+import functools
+
+
+def memoize_read_method(read_method):
+    """Cache the output of a `read_*` method (that takes no arguments) in the `_cache` dictionary of the instance, so
+    that the file it reads from is parsed only once."""
+    @functools.wraps(read_method)
+    def memoized_read_method(self):
+        if read_method.__name__ not in self._cache:
+            self._cache[read_method.__name__] = read_method(self)
+        return self._cache[read_method.__name__]
+    return memoized_read_method
@@ -1,6 +1,11 @@
-import numpy
+import json
 import six
 import datetime
+try:
+    # optional: faster JSON parsing
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class JSONableError(Exception):
@@ -8,11 +13,25 @@ class JSONableError(Exception):
     pass
 
 
+def load_json(json_file):
+    """
+    :param json_file: String with the path to the JSON file
+    :return: Contents of the JSON file, parsed with `orjson` if it is installed
+    """
+    if orjson is None:
+        with open(json_file, 'r') as fr:
+            return json.load(fr)
+    with open(json_file, 'rb') as fr:
+        return orjson.loads(fr.read())
+
+
 def datetime_to_str(time):
     return '{:0>4d}{:0>2d}{:0>2d}{:0>2d}{:0>2d}'.format(time.year, time.month, time.day, time.hour, time.minute)
 
 
 def jsonable(data, ignore_failures=True):
+    # imported here, so that loading settings files (e.g. when breeding) does not need numpy
+    import numpy
     if data is None:
         return
     elif isinstance(data, (bool, int, float, six.string_types)):
@@ -273,12 +273,12 @@ class VaspCalculationData(object):
 
     @property
     def initial_volume_pa(self):
-        if all([v is not None for v in [self.initial_cell_volume, self.n_atoms]]):
+        if all(v is not None for v in [self.initial_cell_volume, self.n_atoms]):
             return self.initial_cell_volume/self.n_atoms
 
     @property
     def final_volume_pa(self):
-        if all([v is not None for v in [self.final_cell_volume, self.n_atoms]]):
+        if all(v is not None for v in [self.final_cell_volume, self.n_atoms]):
             return self.final_cell_volume/self.n_atoms
 
     @property
@@ -317,12 +317,7 @@ class VaspCalculationData(object):
         return self.is_scf_converged()
 
     def are_forces_converged(self, threshold=1E-2):
-        converged = True
-        for atom_forces in self.forces[self.n_ionic_steps - 1]:
-            if any([abs(f) > abs(threshold) for f in atom_forces]):
-                converged = False
-                break
-        return converged
+        return not (numpy.abs(self.forces[self.n_ionic_steps - 1]) > abs(threshold)).any()
 
     @property
     def forces_converged(self):
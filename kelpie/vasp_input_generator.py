@@ -1,6 +1,10 @@
 import os
+import re
+import copy
 import math
+import shutil
 import six
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import kelpie
 from kelpie import io
 from kelpie.structure import Structure
@@ -9,6 +13,40 @@ from kelpie.vasp_settings.potcar import VASP_RECO_POTCARS
 from kelpie.data import STD_ATOMIC_WEIGHTS, VALENCE_ELECTRONS
 
 
+#: matches the value in "ENMAX  =  400.000; ENMIN  =  300.000 eV" lines of a POTCAR
+_ENMAX_RE = re.compile(br'ENMAX\s*=\s*([0-9.]+)')
+
+#: number of bytes at the top of a POTCAR that is expected to contain the ENMAX line
+_POTCAR_HEADER_SIZE = 4096
+
+#: maximum number of threads used to read POTCAR files concurrently
+_MAX_POTCAR_READERS = 8
+
+
+def _format_vasp_tag_value(value):
+    """Format the value of an INCAR tag, dispatching on the type of `value` (or its nearest base class)."""
+    for value_type in type(value).__mro__:
+        formatter = _VASP_TAG_VALUE_FORMATTERS.get(value_type)
+        if formatter is not None:
+            return formatter(value)
+    return str(value)
+
+
+#: formatters for the values of INCAR tags by type
+_VASP_TAG_VALUE_FORMATTERS = {
+    list: lambda value: ' '.join(map(_format_vasp_tag_value, value)),
+    six.text_type: six.text_type.upper,
+    bool: lambda value: f'.{str(value).upper()}.',
+    float: lambda value: f'{value:.2E}',
+}
+
+
+def _read_file(file_location):
+    """:return: contents of the file at `file_location` as bytes"""
+    with open(file_location, 'rb') as fr:
+        return fr.read()
+
+
 class VaspInputError(Exception):
     """Base class for errors in VASP input files."""
     pass
@@ -73,9 +111,11 @@ class VaspInputGenerator(object):
     @calculation_settings.setter
     def calculation_settings(self, calculation_settings):
         if not calculation_settings:
+            # a fresh copy of the defaults, so the updates below (ENCUT, EDIFF, ...) do not leak into them
             self._calculation_settings = DEFAULT_VASP_INCAR_SETTINGS['relaxation']
         else:
-            self._calculation_settings = calculation_settings
+            # a copy as well, so that the same settings can be reused for other structures
+            self._calculation_settings = copy.deepcopy(calculation_settings)
 
         # if ENCUT is not set in calculation settings, set it manually
         if self._calculation_settings.get('encut') is None:
@@ -108,16 +148,7 @@ class VaspInputGenerator(object):
             self._write_location = write_location
 
     def vasp_tag_value_formatter(self, value):
-        if isinstance(value, list):
-            return ' '.join(map(self.vasp_tag_value_formatter, value))
-        elif isinstance(value, six.string_types):
-            return value.upper()
-        elif isinstance(value, bool):
-            return '.{}.'.format(str(value).upper())
-        elif isinstance(value, float):
-            return '{:.2E}'.format(value)
-        else:
-            return str(value)
+        return _format_vasp_tag_value(value)
 
     def format_vasp_tag(self, tag, value):
         """Format INCAR tags and corresponding values to be printed in the INCAR.
@@ -129,7 +160,7 @@ class VaspInputGenerator(object):
         :return: formatted tag, value
         :rtype: str
         """
-        return '{:14s} = {}'.format(tag.upper(), self.vasp_tag_value_formatter(value))
+        return f'{tag.upper():14s} = {self.vasp_tag_value_formatter(value)}'
 
     @staticmethod
     def _concatenate_potcars(list_of_potcar_files):
@@ -141,11 +172,36 @@ class VaspInputGenerator(object):
         :rtype: str
 
         """
-        concatenated_potcar = ''
-        for potcar_file in list_of_potcar_files:
-            with open(potcar_file, 'r') as fr:
-                concatenated_potcar += fr.read()
-        return concatenated_potcar
+        return b''.join(VaspInputGenerator._read_potcar_files(_read_file, list_of_potcar_files)).decode()
+
+    @staticmethod
+    def _read_potcar_files(reader, list_of_potcar_files):
+        """Read a list of POTCAR files concurrently (to hide the latency of parallel filesystems).
+
+        :param reader: function that takes the path to a POTCAR file and returns (part of) its contents.
+        :param list_of_potcar_files: relative/absolute path of a list of VASP POTCAR files.
+        :type list_of_potcar_files: list(str)
+        :return: output of `reader` for each POTCAR file, in the same order as `list_of_potcar_files`
+        :rtype: list
+        """
+        max_workers = max(1, min(_MAX_POTCAR_READERS, len(list_of_potcar_files)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(reader, list_of_potcar_files))
+
+    @staticmethod
+    def _read_potcar_header(potcar_file):
+        """Read the header of a POTCAR file, i.e., just enough of it to include the ENMAX line.
+
+        :param potcar_file: relative/absolute path of a VASP POTCAR file.
+        :type potcar_file: str
+        :return: header of the POTCAR (the full POTCAR if ENMAX is not found near the top)
+        :rtype: bytes
+        """
+        with open(potcar_file, 'rb') as fr:
+            header = fr.read(_POTCAR_HEADER_SIZE)
+            if _ENMAX_RE.search(header) is None:
+                header += fr.read()
+        return header
 
     @property
     def POTCAR(self):
@@ -159,14 +215,22 @@ class VaspInputGenerator(object):
     def _get_vasp_potcar(self):
         """Construct the VASP POTCAR for `self.POSCAR`.
 
+        :return: VASP POTCAR file
+        :rtype: str
+        """
+        return self._concatenate_potcars(self._get_list_of_potcar_files())
+
+    def _get_list_of_potcar_files(self):
+        """Locate the VASP POTCAR file of every species in `self.structure`.
+
         If `self.calculation_settings['potcar_settings']['element_potcars'] dictionary:
         (a) is empty: defaults are used from `kelpie.vasp_settings.potcar.VASP_RECO_POTCARS`.
         (b) has actual location of POTCARs as values to element keys, they are used directly.
         (c) has VASP POTCAR tag (e.g. "Mn_pv") as values to element keys, corresponding POTCARs are used from the
             local POTCAR library.
 
-        :return: VASP POTCAR file
-        :rtype: str
+        :return: locations of the POTCAR files, in the order they should be concatenated
+        :rtype: list(str)
         :raise VaspInputError: if POTCAR file for any element is not found.
         """
         potcar_settings = self.calculation_settings['potcar_settings']
@@ -203,22 +267,20 @@ class VaspInputGenerator(object):
                 else:
                     error_message = 'POTCAR file {} for {} not found'.format(potcar_file, species)
                     raise VaspInputError(error_message)
-        return self._concatenate_potcars(list_of_potcars)
+        return list_of_potcars
 
     @staticmethod
     def get_highest_enmax(vasp_potcar):
-        """Make a list of all ENMAX values in the POTCAR, return the highest among them.
+        """Find all ENMAX values in the POTCAR, return the highest among them.
 
         :param vasp_potcar: VASP POTCAR file
-        :type vasp_potcar: str (with linebreaks)
+        :type vasp_potcar: str or bytes (with linebreaks)
         :return: highest ENMAX value from the POTCAR
         :rtype: float
         """
-        list_of_enmax = []
-        for line in vasp_potcar.split('\n'):
-            if 'ENMAX' in line:
-                list_of_enmax.append(float(line.strip().split()[2].strip(';')))
-        return max(list_of_enmax)
+        if isinstance(vasp_potcar, six.text_type):
+            vasp_potcar = vasp_potcar.encode('ascii', 'ignore')
+        return max(map(float, _ENMAX_RE.findall(vasp_potcar)))
 
     @staticmethod
     def roundup_encut(encut):
@@ -233,12 +295,15 @@ class VaspInputGenerator(object):
     def set_calculation_encut(self):
         """Update `self.calculation_settings['encut']` = encut_scaling_factor*(highest ENMAX from `self.POTCAR`).
 
+        Only the headers of the POTCAR files are read to find the ENMAX values.
+
         If `encut_scaling_factor` is not specified in calculation settings, 1.5 is used as default.
         If `maximum_encut` is not specified in calculation settings, 600 (in eV) is used as default.
         """
         encut_scaling_factor = self.calculation_settings.get('encut_scaling_factor', 1.5)
         maximum_encut = self.calculation_settings.get('maximum_encut', 600)
-        encut = self.roundup_encut(encut_scaling_factor*self.get_highest_enmax(self.POTCAR))
+        potcar_headers = b''.join(self._read_potcar_files(self._read_potcar_header, self._get_list_of_potcar_files()))
+        encut = self.roundup_encut(encut_scaling_factor*self.get_highest_enmax(potcar_headers))
         if encut > maximum_encut:
             encut = maximum_encut
         self._calculation_settings.update({'encut': encut})
@@ -262,7 +327,7 @@ class VaspInputGenerator(object):
         self.set_magmom_tag()
 
     def set_ispin(self):
-        if any([a.magmom for a in self.structure.atoms]):
+        if any(a.magmom for a in self.structure.atoms):
             self._calculation_settings.update({'ispin': 2})
         else:
             self._calculation_settings.update({'ispin': 1})
@@ -293,7 +358,7 @@ class VaspInputGenerator(object):
                 ldauu.append(0.)
             ldauj.append(0.)
         # if no species has a Hubbard U value to use, switch off LDAU
-        if all([v == -1 for v in ldaul]):
+        if all(v == -1 for v in ldaul):
             hubbards = {'ldau': False}
             return hubbards
         # otherwise, generate the VASP INCAR TAGS and return as a Dictionary
@@ -329,17 +394,18 @@ class VaspInputGenerator(object):
         :return: VASP INCAR file
         :rtype: str
         """
-        vasp_incar = ''
+        calculation_settings = self.calculation_settings
+        vasp_incar = []
         for tag_block in VASP_INCAR_TAGS['tags']:
-            vasp_incar += '### {} ###\n'.format(tag_block)
+            vasp_incar.append('### {} ###'.format(tag_block))
             for tag in VASP_INCAR_TAGS[tag_block]:
-                value = self.calculation_settings.get(tag)
+                value = calculation_settings.get(tag)
                 if value is None:
                     continue
-                vasp_incar += self.format_vasp_tag(tag, value) + '\n'
-            vasp_incar += '\n'
-        vasp_incar += '# [autogenerated by kelpie v{}] #'.format(kelpie.__version__)
-        return vasp_incar
+                vasp_incar.append(self.format_vasp_tag(tag, value))
+            vasp_incar.append('')
+        vasp_incar.append('# [autogenerated by kelpie v{}] #'.format(kelpie.__version__))
+        return '\n'.join(vasp_incar)
 
     @staticmethod
     def _write_vasp_input_file(file_contents, file_location, overwrite=True):
@@ -357,19 +423,82 @@ class VaspInputGenerator(object):
             fw.write(file_contents)
         return
 
+    def _write_vasp_potcar(self, file_location, overwrite=True):
+        """Concatenate the POTCAR files of all species directly into `file_location`.
+
+        :param file_location: absolute or relative path to the POTCAR file to write
+        :type file_location: str
+        :param overwrite: if `file_location` already exists, should it be overwritten?
+        """
+        if os.path.isfile(file_location) and not overwrite:
+            return
+        # locate all the POTCARs before opening `file_location`, so that a missing one does not leave an empty POTCAR
+        # behind (that would be kept as is when writing again with `overwrite=False`)
+        list_of_potcar_files = self._get_list_of_potcar_files()
+        for potcar_file in list_of_potcar_files:
+            if not os.path.isfile(potcar_file):
+                error_message = 'POTCAR file {} not found'.format(potcar_file)
+                raise VaspInputError(error_message)
+        with open(file_location, 'wb') as fw:
+            for potcar_file in list_of_potcar_files:
+                with open(potcar_file, 'rb') as fr:
+                    shutil.copyfileobj(fr, fw, 65536)
+        return
+
     def write_vasp_input_files(self, overwrite=True):
         """Write VASP POSCAR, POTCAR, and INCAR files into the folder specified by `self.write_location`.
 
         :param overwrite: Should files be overwritten if they already exist? Defaults to True."""
+        # create the write location if it doesn't exist, and list the files already in it in a single pass
+        os.makedirs(self.write_location, exist_ok=True)
+        if overwrite:
+            existing_files = set()
+        else:
+            existing_files = set([f.name for f in os.scandir(self.write_location) if f.is_file()])
+
         # write the POSCAR file
-        poscar_file = os.path.join(self.write_location, 'POSCAR')
-        self._write_vasp_input_file(self.structure.POSCAR, poscar_file, overwrite=overwrite)
+        if 'POSCAR' not in existing_files:
+            poscar_file = os.path.join(self.write_location, 'POSCAR')
+            self._write_vasp_input_file(self.structure.POSCAR, poscar_file)
 
         # write the POTCAR file
-        potcar_file = os.path.join(self.write_location, 'POTCAR')
-        self._write_vasp_input_file(self.POTCAR, potcar_file, overwrite=overwrite)
+        if 'POTCAR' not in existing_files:
+            potcar_file = os.path.join(self.write_location, 'POTCAR')
+            self._write_vasp_potcar(potcar_file)
 
         # write the INCAR file
-        incar_file = os.path.join(self.write_location, 'INCAR')
-        self._write_vasp_input_file(self.INCAR, incar_file, overwrite=overwrite)
-
+        if 'INCAR' not in existing_files:
+            incar_file = os.path.join(self.write_location, 'INCAR')
+            self._write_vasp_input_file(self.INCAR, incar_file)
+
+
+def _write_vasp_input_files(input_generator_args):
+    """Generate and write the VASP input files for a single calculation.
+
+    Defined at the module level so that it can be sent to the worker processes of a `ProcessPoolExecutor`.
+
+    :param input_generator_args: Tuple of (structure, calculation_settings, write_location, overwrite), where
+                                 `structure` is a `kelpie.structure.Structure` object or the path to a POSCAR file
+    """
+    structure, calculation_settings, write_location, overwrite = input_generator_args
+    input_generator = VaspInputGenerator(structure=structure,
+                                         calculation_settings=calculation_settings,
+                                         write_location=write_location)
+    input_generator.write_vasp_input_files(overwrite=overwrite)
+
+
+def write_many_vasp_input_files(list_of_input_generator_args, overwrite=True, max_workers=None, chunksize=8):
+    """Generate and write the VASP input files for many calculations in parallel, using a pool of processes.
+
+    :param list_of_input_generator_args: List of tuples of (structure, calculation_settings, write_location), one
+                                         per calculation, as they would be passed to `VaspInputGenerator`
+    :param overwrite: Should files be overwritten if they already exist? Defaults to True.
+    :param max_workers: Integer with the maximum number of worker processes. (Default: `os.cpu_count()`)
+    :param chunksize: Integer with the number of calculations sent to a worker process at a time. (Default: 8)
+    :raise VaspInputError: if the input files for any of the calculations cannot be generated
+    """
+    tasks = [(structure, calculation_settings, write_location, overwrite)
+             for structure, calculation_settings, write_location in list_of_input_generator_args]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # consume the iterator, so that exceptions raised in the workers are raised here
+        list(executor.map(_write_vasp_input_files, tasks, chunksize=chunksize))
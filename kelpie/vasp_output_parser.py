@@ -1,8 +1,15 @@
 import os
 import gzip
+import functools
 import numpy as np
 import datetime
 from lxml import etree
+from kelpie.utils import memoize_read_method
+try:
+    # optional: ISA-L accelerated inflate for gzipped vasprun.xml files
+    from isal import igzip
+except ImportError:
+    igzip = None
 
 
 class VasprunXMLParserError(Exception):
@@ -10,9 +17,77 @@ class VasprunXMLParserError(Exception):
     pass
 
 
+def _parse_float_matrix(element, row_tag='r', n_columns=None):
+    """Parse all the rows (<r> or <v>) of a <set> or <varray> element in one go, instead of one float() per value.
+
+    :param element: <set>/<varray> element (e.g. forces, DOS, eigenvalues) with N rows of floats each
+    :type element: etree._Element
+    :param row_tag: tag of the rows: 'r' in a <set>, 'v' in a <varray> (default: 'r')
+    :type row_tag: str
+    :param n_columns: number of floats in each row (default: None, number of floats in the first row)
+    :type n_columns: int or None
+    :return: numpy.array of shape (N, `n_columns`); empty numpy.array if `element` is None
+    :rtype: numpy.array
+    """
+    if element is None:
+        return np.array([])
+    rows = [row.text for row in element.iterfind(row_tag)]
+    if n_columns is None:
+        n_columns = len(rows[0].split()) if rows else 0
+    if not rows:
+        return np.empty((0, n_columns))
+    return np.fromstring(' '.join(rows), sep=' ').reshape(-1, n_columns)
+
+
+def _open_vasprunxml(vasprunxml_file):
+    """Open a vasprun.xml or vasprun.xml.gz file for reading as a binary stream."""
+    if os.path.splitext(vasprunxml_file)[-1] == '.gz':
+        return (igzip or gzip).open(vasprunxml_file, 'rb')
+    return open(vasprunxml_file, 'rb')
+
+
+@functools.lru_cache(maxsize=1024)
+def _read_last_free_energy(vasprunxml_file, mtime, size):
+    """Stream through a vasprun.xml file and read the free energy of its final SCF step.
+
+    Every <scstep> is discarded once its energy is read, and every <set> of rows (DOS, eigenvalues, projections) and
+    every block that the parser does not read (`VasprunXMLParser._UNREAD_TAGS`) as soon as it is parsed, so that a
+    whole <calculation> is never held in memory.
+
+    `mtime` and `size` of the file are not used other than to key the cache, so that the output is read again
+    once the file changes.
+    """
+    free_energy = None
+    with _open_vasprunxml(vasprunxml_file) as fr:
+        try:
+            tags = ('scstep', 'calculation', 'set') + VasprunXMLParser._UNREAD_TAGS
+            for event, element in etree.iterparse(fr, events=('end',), tag=tags):
+                if element.tag == 'scstep':
+                    energy = element.find('./energy/i[@name="e_fr_energy"]')
+                    if energy is not None:
+                        free_energy = float(energy.text)
+                # discard the element (and everything before it at the same level): none of it is needed anymore
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+        except etree.XMLSyntaxError:
+            # incomplete vasprun.xml, e.g. of a calculation that is still running
+            pass
+    return free_energy
+
+
 class VasprunXMLParser(object):
     """Base class to parse relevant output from a vasprun.xml file."""
 
+    # XPath expressions compiled once, and evaluated by libxml2
+    _ATOMTYPES_XPATH = etree.XPath('/modeling/atominfo/array[@name="atomtypes"]/set/rc')
+    _ATOMS_XPATH = etree.XPath('/modeling/atominfo/array[@name="atoms"]/set/rc')
+    _CALCULATIONS_XPATH = etree.XPath('/modeling/calculation')
+    _DOS_EFERMI_XPATH = etree.XPath('/modeling/calculation/dos/i[@name="efermi"]/text()')
+
+    # blocks that are not read: projected DOS, projected eigenvalues, and the frequency-dependent dielectric function
+    _UNREAD_TAGS = ('partial', 'projected', 'dielectricfunction')
+
     def __init__(self, vasprunxml_file=None):
         """
         :param vasprunxml_file: name of the vasprun.xml file (default: None)
@@ -20,6 +95,8 @@ class VasprunXMLParser(object):
         """
         self._vasprunxml_file = None
         self._xmlroot = None
+        #: output of the `read_*` methods that have already been called
+        self._cache = {}
 
         self.vasprunxml_file = vasprunxml_file
 
@@ -36,24 +113,41 @@ class VasprunXMLParser(object):
             raise VasprunXMLParserError(error_message)
         self._vasprunxml_file = os.path.abspath(vasprunxml_file)
         self._xmlroot = self._get_vasprunxml_root()
+        self._cache = {}
 
     def _get_vasprunxml_root(self):
         """Read contents from a vasprun.xml or vasprun.xml.gz file, convert it into
         etree.ElementTree and get the root element with tag 'modeling'
 
+        The file is parsed incrementally, and the blocks that none of the `read_*` methods use (`_UNREAD_TAGS`,
+        usually the bulk of the file) are discarded as soon as they are parsed, so that they never take up memory.
+        Gzipped files are decompressed with `isal.igzip` if it is installed.
+
         :raises: VasprunXMLParserError if the root element is not 'modeling'
         :return: root element of vasprun.xml
         :rtype: etree._Element
         """
         if self.vasprunxml_file is None:
             return
-        parser = etree.XMLParser(remove_blank_text=True)
-        try:
-            tree = etree.parse(self.vasprunxml_file, parser=parser)
-        except etree.XMLSyntaxError:
-            return
-        xmlroot = tree.getroot()
-        if xmlroot.tag != 'modeling':
+        with _open_vasprunxml(self.vasprunxml_file) as fr:
+            context = etree.iterparse(fr, events=('start', 'end'), tag=self._UNREAD_TAGS + ('set',),
+                                      remove_blank_text=True)
+            n_open_unread_blocks = 0
+            try:
+                for event, element in context:
+                    if element.tag in self._UNREAD_TAGS:
+                        n_open_unread_blocks += 1 if event == 'start' else -1
+                        if event == 'end':
+                            element.clear()
+                    elif n_open_unread_blocks and event == 'end':
+                        # discard every <set> inside an unread block (and the ones before it) as soon as it is parsed
+                        element.clear()
+                        while element.getprevious() is not None:
+                            del element.getparent()[0]
+            except etree.XMLSyntaxError:
+                return
+        xmlroot = context.root
+        if xmlroot is None or xmlroot.tag != 'modeling':
             error_message = 'Root element of vasprun.xml "modeling" not found'
             raise VasprunXMLParserError(error_message)
         return xmlroot
@@ -62,6 +156,26 @@ class VasprunXMLParser(object):
     def xmlroot(self):
         return self._xmlroot
 
+    @classmethod
+    def read_last_free_energy(cls, vasprunxml_file):
+        """Read the free energy at the end of the final ionic step, without building the whole XML tree.
+
+        Meant for quick checks on (possibly still running) calculations; results are cached until the file changes.
+        The convergence checks of `kelpie.calculation_workflows` do not use it: they also need the forces, lattice
+        vectors and band occupations, which are read with the full parser anyway.
+
+        :param vasprunxml_file: name of the vasprun.xml file
+        :type vasprunxml_file: str
+        :return: free energy at the end of the final ionic step, None if not found
+        :rtype: float or None
+        """
+        if not os.path.isfile(vasprunxml_file):
+            error_message = 'Cannot find the specified vasprun.xml file: {}'.format(vasprunxml_file)
+            raise VasprunXMLParserError(error_message)
+        stat = os.stat(vasprunxml_file)
+        return _read_last_free_energy(os.path.abspath(vasprunxml_file), stat.st_mtime_ns, stat.st_size)
+
+    @memoize_read_method
     def read_composition_information(self):
         """Read the list of elemental species in the unit cell, and number of atoms, atomic mass, number of valence
         electrons, VASP pseudopotential title tag for each species.
@@ -72,20 +186,17 @@ class VasprunXMLParser(object):
         """
         composition_info = {}
         if self.xmlroot is not None:
-            atomtypes_array = self.xmlroot.findall('./atominfo/array')
-            for array in atomtypes_array:
-                if array.attrib['name'] != 'atomtypes':
-                    continue
-                for species in array.findall('./set/rc'):
-                    natoms, elem, mass, valence, psp = [c.text.strip() for c in species.findall('c')]
-                    composition_info.update({elem: {'natoms': int(natoms),
-                                                    'atomic_mass': float(mass),
-                                                    'valence': float(valence),
-                                                    'pseudopotential': psp
-                                                    }
-                                            })
+            for species in self._ATOMTYPES_XPATH(self.xmlroot):
+                natoms, elem, mass, valence, psp = [c.text.strip() for c in species.findall('c')]
+                composition_info.update({elem: {'natoms': int(natoms),
+                                                'atomic_mass': float(mass),
+                                                'valence': float(valence),
+                                                'pseudopotential': psp
+                                                }
+                                        })
         return composition_info
 
+    @memoize_read_method
     def read_list_of_atoms(self):
         """Read the list of atoms in the unit cell.
 
@@ -94,15 +205,12 @@ class VasprunXMLParser(object):
         """
         atomslist = []
         if self.xmlroot is not None:
-            atoms_array = self.xmlroot.findall('./atominfo/array')
-            for array in atoms_array:
-                if array.attrib['name'] != 'atoms':
-                    continue
-                for species in array.findall('./set/rc'):
-                    atom_symbol, atomtype = [c.text.strip() for c in species.findall('c')]
-                    atomslist.append(atom_symbol)
+            for species in self._ATOMS_XPATH(self.xmlroot):
+                atom_symbol, atomtype = [c.text.strip() for c in species.findall('c')]
+                atomslist.append(atom_symbol)
         return atomslist
 
+    @memoize_read_method
     def read_number_of_ionic_steps(self):
         """Read number of ionic steps in the VASP run.
 
@@ -110,8 +218,9 @@ class VasprunXMLParser(object):
         :rtype: int
         """
         if self.xmlroot is not None:
-            return len(self.xmlroot.findall('./calculation'))
+            return len(self._CALCULATIONS_XPATH(self.xmlroot))
 
+    @memoize_read_method
     def read_scf_energies(self):
         """Read all the the energies in every ionic step.
 
@@ -120,17 +229,13 @@ class VasprunXMLParser(object):
         """
         scf_energies = {}
         if self.xmlroot is not None:
-            ionic_steps = self.xmlroot.findall('./calculation')
+            ionic_steps = self._CALCULATIONS_XPATH(self.xmlroot)
             for n_ionic_step, ionic_step in enumerate(ionic_steps):
-                scsteps = ionic_step.findall('scstep')
-                scstep_energies = []
-                for scstep in scsteps:
-                    for energy in scstep.findall('./energy/i'):
-                        if energy.attrib['name'] == 'e_fr_energy':
-                            scstep_energies.append(float(energy.text.strip()))
-                scf_energies[n_ionic_step] = scstep_energies
+                energies = ionic_step.xpath('./scstep/energy/i[@name="e_fr_energy"]/text()')
+                scf_energies[n_ionic_step] = [float(e) for e in energies]
         return scf_energies
 
+    @memoize_read_method
     def read_entropies(self):
         """Read entropy at the end of each ionic step.
 
@@ -139,17 +244,13 @@ class VasprunXMLParser(object):
         """
         entropy_dict = {}
         if self.xmlroot is not None:
-            ionic_steps = self.xmlroot.findall('./calculation')
+            ionic_steps = self._CALCULATIONS_XPATH(self.xmlroot)
             for n_ionic_step, ionic_step in enumerate(ionic_steps):
-                entropy = None
-                final_scstep = ionic_step.findall('scstep')[-1]
-                for final_energy_block in final_scstep.findall('energy'):
-                    for energy in final_energy_block.findall('i'):
-                        if energy.attrib['name'] == 'eentropy':
-                            entropy = float(energy.text.strip())
-                entropy_dict[n_ionic_step] = entropy
+                entropy = ionic_step.xpath('./scstep[last()]/energy/i[@name="eentropy"]/text()')
+                entropy_dict[n_ionic_step] = float(entropy[-1]) if entropy else None
         return entropy_dict
 
+    @memoize_read_method
     def read_free_energies(self):
         """Read free energy at the end of each ionic step.
 
@@ -158,59 +259,71 @@ class VasprunXMLParser(object):
         """
         free_energy_dict = {}
         if self.xmlroot is not None:
-            ionic_steps = self.xmlroot.findall('./calculation')
+            ionic_steps = self._CALCULATIONS_XPATH(self.xmlroot)
             for n_ionic_step, ionic_step in enumerate(ionic_steps):
-                free_energy = None
-                final_scstep = ionic_step.findall('scstep')[-1]
-                for final_energy_block in final_scstep.findall('energy'):
-                    for energy in final_energy_block.findall('i'):
-                        if energy.attrib['name'] == 'e_fr_energy':
-                            free_energy = float(energy.text.strip())
-                free_energy_dict[n_ionic_step] = free_energy
+                free_energy = ionic_step.xpath('./scstep[last()]/energy/i[@name="e_fr_energy"]/text()')
+                free_energy_dict[n_ionic_step] = float(free_energy[-1]) if free_energy else None
         return free_energy_dict
 
+    def _read_vectors_of_ionic_steps(self, varray_path, n_vectors):
+        """Read a <varray> of `n_vectors` vectors at the end of each ionic step into a single contiguous array.
+
+        :param varray_path: path to the <varray> relative to each <calculation> element
+        :type varray_path: str
+        :param n_vectors: number of <v> vectors in the <varray>
+        :type n_vectors: int
+        :return: numpy.array of shape (N_ionic_steps, `n_vectors`, 3); ionic steps without the <varray> are NaN
+        :rtype: numpy.array
+        """
+        if self.xmlroot is None:
+            return np.empty((0, n_vectors, 3))
+        ionic_steps = self._CALCULATIONS_XPATH(self.xmlroot)
+        vectors = np.full((len(ionic_steps), n_vectors, 3), np.nan)
+        for n_ionic_step, ionic_step in enumerate(ionic_steps):
+            varray = ionic_step.find(varray_path)
+            if varray is not None:
+                vectors[n_ionic_step] = _parse_float_matrix(varray, row_tag='v', n_columns=3)
+        return vectors
+
+    @memoize_read_method
+    def read_forces_array(self):
+        """Read forces on all atoms in the unit cell at the end of every ionic step into a single array.
+
+        :return: [[[fx_1, fy_1, fz_1], [fx_2, fy_2, fz_2], ...], ...]
+        :rtype: numpy.array of shape (N_ionic_steps, N_atoms, 3)
+        """
+        return self._read_vectors_of_ionic_steps('./varray[@name="forces"]', len(self.read_list_of_atoms()))
+
+    @memoize_read_method
     def read_forces(self):
         """Read forces on all atoms in the unit cell at the end of each ionic step.
 
         :return: {ionic_step_1: [[fx_1, fy_1, fz_1], [fx_2, fy_2, fz_2], ...], ionic_step_2: ...}
         :rtype: dict(int, numpy.array)
-                - numpy.array of shape (N_atoms, 3)
+                - numpy.array of shape (N_atoms, 3), a view into `self.read_forces_array()`
         """
-        forces_dict = {}
-        if self.xmlroot is not None:
-            ionic_steps = self.xmlroot.findall('./calculation')
-            for n_ionic_step, ionic_step in enumerate(ionic_steps):
-                varrays = ionic_step.findall('varray')
-                forces = []
-                for varray in varrays:
-                    if varray.attrib['name'] != 'forces':
-                        continue
-                    for force_on_atom in varray.findall('v'):
-                        forces.append([float(e) for e in force_on_atom.text.split()])
-                forces_dict[n_ionic_step] = np.array(forces)
-        return forces_dict
+        return dict(enumerate(self.read_forces_array()))
+
+    @memoize_read_method
+    def read_stress_tensors_array(self):
+        """Read stress (in kbar) on the unit cell at the end of every ionic step into a single array.
 
+        :return: [[[Sxx, Sxy, Sxz], [Syx, Syy, Syz], [Szx, Szy, Szz]], ...]
+        :rtype: numpy.array of shape (N_ionic_steps, 3, 3)
+        """
+        return self._read_vectors_of_ionic_steps('./varray[@name="stress"]', 3)
+
+    @memoize_read_method
     def read_stress_tensors(self):
         """Read stress (in kbar) on the unit cell at the end of each ionic step.
 
         :return: {ionic_step_1: [[Sxx, Sxy, Sxz], [Syx, Syy, Syz], [Szx, Szy, Szz]], ionic_step_2: ...}
         :rtype: dict(int, numpy.array)
-                - numpy.array of shape (3, 3)
+                - numpy.array of shape (3, 3), a view into `self.read_stress_tensors_array()`
         """
-        stress_tensor_dict = {}
-        if self.xmlroot is not None:
-            ionic_steps = self.xmlroot.findall('./calculation')
-            for n_ionic_step, ionic_step in enumerate(ionic_steps):
-                varrays = ionic_step.findall('varray')
-                stress_tensor = []
-                for varray in varrays:
-                    if varray.attrib['name'] != 'stress':
-                        continue
-                    for stress_component in varray.findall('v'):
-                        stress_tensor.append([float(e) for e in stress_component.text.split()])
-                stress_tensor_dict[n_ionic_step] = np.array(stress_tensor)
-        return stress_tensor_dict
+        return dict(enumerate(self.read_stress_tensors_array()))
 
+    @memoize_read_method
     def read_lattice_vectors(self):
         """Read lattice vectors (in Angstrom) of the unit cell at the end of each ionic step.
 
@@ -220,36 +333,32 @@ class VasprunXMLParser(object):
         """
         lattice_vectors_dict = {}
         if self.xmlroot is not None:
-            ionic_steps = self.xmlroot.findall('./calculation')
+            ionic_steps = self._CALCULATIONS_XPATH(self.xmlroot)
             for n_ionic_step, ionic_step in enumerate(ionic_steps):
-                varrays = ionic_step.findall('./structure/crystal/varray')
-                lattice_vectors = []
-                for varray in varrays:
-                    if varray.attrib['name'] != 'basis':
-                        continue
-                    for lattice_vector in varray.findall('v'):
-                        lattice_vectors.append([float(e) for e in lattice_vector.text.split()])
-                lattice_vectors_dict[n_ionic_step] = np.array(lattice_vectors)
+                basis = ionic_step.find('./structure/crystal/varray[@name="basis"]')
+                lattice_vectors_dict[n_ionic_step] = _parse_float_matrix(basis, row_tag='v', n_columns=3)
         return lattice_vectors_dict
 
+    @memoize_read_method
     def read_atomic_coordinates(self):
         """Read positions of all the atoms at the end of each ionic step.
 
-        :return: {ionic_step_1: [[species_1, [x1, y1, z1]], [species_2, [x2, y2, z2]], ...], ionic_step_2: ...}
-        :rtype: dict(int, list(list(str, numpy.array)))
+        :return: {ionic_step_1: [[x1, y1, z1], [x2, y2, z2], ...], ionic_step_2: ...}
+        :rtype: dict(int, numpy.array)
+                - numpy.array of shape (N_atoms, 3)
         """
         atomic_coordinates = {}
         if self.xmlroot is not None:
-            ionic_steps = self.xmlroot.findall('calculation')
+            ionic_steps = self._CALCULATIONS_XPATH(self.xmlroot)
             for n_ionic_step, ionic_step in enumerate(ionic_steps):
-                atomic_coordinates[n_ionic_step] = []
                 varray = ionic_step.find('./structure/varray')
                 if varray.attrib['name'] != 'positions':
+                    atomic_coordinates[n_ionic_step] = np.empty((0, 3))
                     continue
-                for coordinates in varray.findall('v'):
-                    atomic_coordinates[n_ionic_step].append([float(e) for e in coordinates.text.split()])
+                atomic_coordinates[n_ionic_step] = _parse_float_matrix(varray, row_tag='v', n_columns=3)
         return atomic_coordinates
 
+    @memoize_read_method
     def read_cell_volumes(self):
         """Read the volume (in cubic Angstrom) of the unit cell at the end of each ionic step.
 
@@ -258,12 +367,13 @@ class VasprunXMLParser(object):
         """
         volume_dict = {}
         if self.xmlroot is not None:
-            ionic_steps = self.xmlroot.findall('calculation')
+            ionic_steps = self._CALCULATIONS_XPATH(self.xmlroot)
             for n_ionic_step, ionic_step in enumerate(ionic_steps):
                 volume = float(ionic_step.find('./structure/crystal/i').text.strip())
                 volume_dict[n_ionic_step] = volume
         return volume_dict
 
+    @memoize_read_method
     def read_kpoint_mesh(self):
         """Read the k-point mesh (k_x, k_y, k_z) used in the calculation.
 
@@ -277,70 +387,77 @@ class VasprunXMLParser(object):
                     kmesh = [int(k) for k in v.text.split()]
                     return kmesh
 
+    @memoize_read_method
     def read_irreducible_kpoints(self):
         """Read all the irreducible k-points used in the calculation.
 
         :return: [[kx_1, ky_1, kz_1], [kx_2, ky_2, kz_2], ...]
-        :rtype: list(list(float))
+        :rtype: numpy.array of shape (N_kpoints, 3)
         """
-        kpoints = []
+        kpoints = np.empty((0, 3))
         if self.xmlroot is not None:
             kpoints_block = self.xmlroot.find('kpoints')
             for kpointlist in kpoints_block.findall('varray'):
                 if kpointlist.attrib['name'] == 'kpointlist':
-                    for v in kpointlist.findall('v'):
-                        kpoints.append([float(k) for k in v.text.split()])
+                    kpoints = _parse_float_matrix(kpointlist, row_tag='v', n_columns=3)
         return kpoints
 
+    @memoize_read_method
     def read_total_density_of_states(self):
         """
         :return: Total density of states data {'spin_1': [[energy1, dos1, intdos_1], ...], 'spin_2': ...}
-        :rtype: dict(str, list(list(float)))
+        :rtype: dict(str, numpy.array)
+                - numpy.array of shape (N_gridpoints, 3)
         """
         total_dos_data = {}
         if self.xmlroot is not None:
             dos_block = self.xmlroot.find('./calculation/dos')
             for spin in dos_block.findall('./total/array/set/set'):
-                spin_data = []
-                for gridpoint in spin.findall('r'):
-                    spin_data.append([float(e) for e in gridpoint.text.strip().split()])
-                total_dos_data[spin.attrib['comment'].replace(' ', '_')] = spin_data
+                total_dos_data[spin.attrib['comment'].replace(' ', '_')] = _parse_float_matrix(spin, row_tag='r')
         return total_dos_data
 
+    @memoize_read_method
     def read_fermi_energy(self):
         """
         :return: the Fermi energy in eV
         :rtype: float or None
         """
-        try:
-            fermi_energy = float(self.xmlroot.find('./calculation/dos/i').text.strip())
-        except (AttributeError, TypeError) as error:
-            fermi_energy = None
-        return fermi_energy
+        if self.xmlroot is None:
+            return
+        fermi_energy = self._DOS_EFERMI_XPATH(self.xmlroot)
+        if not fermi_energy:
+            return
+        return float(fermi_energy[0])
 
+    @memoize_read_method
     def read_band_occupations(self):
         """Read occupation of every band at every k-point for each spin channel.
 
         :return: {'spin_1': {kpoint_1: {'band_energy': [band1, ...], 'occupation': [occ1, ...]}, 'kpoint_2': ...}}
-        :rtype: dict(str, dict(int, dict(str, list(float))))
+        :rtype: dict(str, dict(int, dict(str, numpy.array)))
+                - numpy.array of shape (N_bands,)
         """
         occupations_dict = {}
         if self.xmlroot is not None:
-            final_ionic_step = self.xmlroot.findall('calculation')[-1]
+            final_ionic_step = self._CALCULATIONS_XPATH(self.xmlroot)[-1]
             eigenvalues = final_ionic_step.find('eigenvalues')
             if eigenvalues is not None:
                 for spin_set in eigenvalues.findall('./array/set/set'):
                     spin = spin_set.attrib['comment'].replace(' ', '_')
                     occupations_dict[spin] = {}
-                    for kpoint_set in spin_set.findall('./set'):
-                        kpoint = int(kpoint_set.attrib['comment'].split()[-1])
-                        occupations_dict[spin][kpoint] = {'band_energy': [], 'occupation': []}
-                        for band in kpoint_set.findall('./r'):
-                            be, occ = [float(b) for b in band.text.strip().split()]
-                            occupations_dict[spin][kpoint]['band_energy'].append(be)
-                            occupations_dict[spin][kpoint]['occupation'].append(occ)
+                    kpoint_sets = spin_set.findall('./set')
+                    if not kpoint_sets:
+                        continue
+                    kpoints = [int(kpoint_set.attrib['comment'].split()[-1]) for kpoint_set in kpoint_sets]
+                    # parse all the bands at all the k-points in one go: rows of [band_energy, occupation]
+                    bands = ' '.join([band.text for band in spin_set.iterfind('./set/r')])
+                    bands = np.fromstring(bands, sep=' ').reshape(len(kpoint_sets), -1, 2)
+                    for kpoint, kpoint_bands in zip(kpoints, bands):
+                        occupations_dict[spin][kpoint] = {'band_energy': kpoint_bands[:, 0],
+                                                          'occupation': kpoint_bands[:, 1]}
         return occupations_dict
 
+    @memoize_read_method
     def read_run_timestamp(self):
         """Read the time and date when the calulation was run.
 
@@ -357,6 +474,7 @@ class VasprunXMLParser(object):
                     hour, minute, second = [int(f) for f in field.text.strip().split(':')]
             return datetime.datetime(year=year, month=month, day=day, hour=hour, minute=minute, second=second)
 
+    @memoize_read_method
     def read_scf_looptimes(self):
         """Read total time taken for each SCF loop during the run.
 
@@ -365,7 +483,7 @@ class VasprunXMLParser(object):
         """
         scf_looptimes = {}
         if self.xmlroot is not None:
-            ionic_steps = self.xmlroot.findall('./calculation')
+            ionic_steps = self._CALCULATIONS_XPATH(self.xmlroot)
             for n_ionic_step, ionic_step in enumerate(ionic_steps):
                 scsteps = ionic_step.findall('scstep')
                 scstep_times = []
@@ -1,23 +1,52 @@
 import os
-import json
+import copy
+from collections.abc import Mapping
+from kelpie.utils.serialization import load_json
 
 # read in VASP INCAR tags and the corresponding groups
 current_dir = os.path.dirname(os.path.abspath(__file__))
 incar_tags_file = os.path.join(current_dir, 'incar_tags_dict.json')
 # module variable VASP_INCAR_TAGS
-with open(incar_tags_file, 'r') as fr:
-    VASP_INCAR_TAGS = json.load(fr)
+VASP_INCAR_TAGS = load_json(incar_tags_file)
 
-# read in default VASP settings for difference calculation_types
+# default VASP settings for difference calculation_types
 calculation_types = ['relaxation', 'static', 'acc_std_relax', 'sc_forces']
+# settings read from "[calculation_type].json", each file is read at most once per process
+_DEFAULT_SETTINGS_CACHE = {}
+
+
+def get_default_settings(calculation_type):
+    """Default VASP settings for `calculation_type`, read from the corresponding JSON file on first use.
+
+    :param calculation_type: String with one of the `calculation_types`
+    :return: Dictionary with a copy of the default settings that is safe to modify
+    :raise KeyError: if `calculation_type` is not one of the `calculation_types`
+    """
+    if calculation_type not in _DEFAULT_SETTINGS_CACHE:
+        if calculation_type not in calculation_types:
+            raise KeyError(calculation_type)
+        settings_file = os.path.join(current_dir, '{}.json'.format(calculation_type))
+        _DEFAULT_SETTINGS_CACHE[calculation_type] = load_json(settings_file)
+    return copy.deepcopy(_DEFAULT_SETTINGS_CACHE[calculation_type])
+
+
+class _DefaultVaspIncarSettings(Mapping):
+    """Read-only mapping of calculation type to its default settings. Every lookup returns a fresh copy, so that
+    updating the settings for one calculation never changes the defaults."""
+
+    def __getitem__(self, calculation_type):
+        return get_default_settings(calculation_type)
+
+    def __iter__(self):
+        return iter(calculation_types)
+
+    def __len__(self):
+        return len(calculation_types)
+
+
 # module variable DEFAULT_VASP_INCAR_SETTINGS
-DEFAULT_VASP_INCAR_SETTINGS = {}
-for calculation_type in calculation_types:
-    settings_file = os.path.join(current_dir, '{}.json'.format(calculation_type))
-    with open(settings_file, 'r') as fr:
-        DEFAULT_VASP_INCAR_SETTINGS[calculation_type] = json.load(fr)
+DEFAULT_VASP_INCAR_SETTINGS = _DefaultVaspIncarSettings()
 
 # read in Hubbard U values (currently only from Wang et al., PRB 73, 195107 (2006))
 hubbard_values_file = os.path.join(current_dir, 'hubbards.json')
-with open(hubbard_values_file, 'r') as fr:
-    HUBBARD_U_VALUES = json.load(fr)
+HUBBARD_U_VALUES = load_json(hubbard_values_file)
@@ -0,0 +1,124 @@
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from kelpie.breeder import KelpieBreeder, KelpieBreederError
+
+
+tests_dir = os.path.dirname(__file__)
+sample_vasp_input_dir = os.path.join(tests_dir, 'sample_vasp_input')
+
+
+class TestKelpieBreeder(unittest.TestCase):
+    """Base class to test kelpie.breeder.KelpieBreeder class."""
+
+    def setUp(self):
+        self.structure_file = os.path.join(sample_vasp_input_dir, 'POSCAR.all_OK')
+        self.settings_file = os.path.join(tests_dir, 'custom_scheduler.json')
+        self.template_file = os.path.join(tests_dir, 'custom_template.q')
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _write_fake_sbatch(self):
+        fake_sbatch = os.path.join(self.tmp_dir, 'sbatch')
+        with open(fake_sbatch, 'w') as fw:
+            fw.write('#!/bin/sh\necho "$@" > sbatch_args.txt\necho "12345;cluster"\n')
+        os.chmod(fake_sbatch, os.stat(fake_sbatch).st_mode | stat.S_IEXEC)
+        return fake_sbatch
+
+    def test_input_structure_file_not_found(self):
+        with self.assertRaises(KelpieBreederError):
+            KelpieBreeder(input_structure_file='POSCAR.file_not_found')
+
+    def test_host_scheduler_settings_file(self):
+        kb = KelpieBreeder(input_structure_file=self.structure_file, host_scheduler_settings=self.settings_file)
+        self.assertEqual(kb.host_scheduler_settings['account'], '1673')
+        kb.host_scheduler_settings['account'] = '0000'
+        kb = KelpieBreeder(input_structure_file=self.structure_file, host_scheduler_settings=self.settings_file)
+        self.assertEqual(kb.host_scheduler_settings['account'], '1673')
+
+    def test_custom_scheduler_settings_dict(self):
+        kb = KelpieBreeder(input_structure_file=self.structure_file, custom_scheduler_settings={'qos': 'debug'})
+        self.assertDictEqual(kb.custom_scheduler_settings, {'qos': 'debug'})
+
+    def test_custom_scheduler_settings_none(self):
+        kb = KelpieBreeder(input_structure_file=self.structure_file, custom_scheduler_settings=None)
+        self.assertDictEqual(kb.custom_scheduler_settings, {})
+        self.assertIn('module load vasp', kb.batch_script)
+
+    def test_batch_script(self):
+        kb = KelpieBreeder(input_structure_file=self.structure_file,
+                           host_scheduler_settings=self.settings_file,
+                           batch_script_template=self.template_file)
+        self.assertEqual(kb.scheduler_script_name, 'custom_template.q')
+        self.assertIn('#SBATCH -A 1673', kb.batch_script.split('\n'))
+
+    def test_batch_script_is_cached(self):
+        kb = KelpieBreeder(input_structure_file=self.structure_file)
+        self.assertIs(kb.batch_script, kb.batch_script)
+        kb.custom_scheduler_settings = {'account': '0000'}
+        self.assertIn('#SBATCH -A 0000', kb.batch_script.split('\n'))
+
+    def test_batch_script_missing_field(self):
+        template_file = os.path.join(self.tmp_dir, 'template.q')
+        with open(template_file, 'w') as fw:
+            fw.write('#SBATCH -J {job-name}\n#SBATCH --reservation={reservation}\n')
+        kb = KelpieBreeder(input_structure_file=self.structure_file, batch_script_template=template_file)
+        with self.assertRaises(KelpieBreederError):
+            kb.batch_script
+        kb.custom_scheduler_settings = {'reservation': 'vasp'}
+        self.assertTrue(kb.batch_script.endswith('--reservation=vasp\n'))
+
+    def test_from_directory_sweep(self):
+        for name in ['b', 'a', 'empty']:
+            os.makedirs(os.path.join(self.tmp_dir, name))
+        for name in ['a', 'b']:
+            shutil.copy(self.structure_file, os.path.join(self.tmp_dir, name, 'POSCAR'))
+        breeders = KelpieBreeder.from_directory_sweep(self.tmp_dir, custom_scheduler_settings={'qos': 'debug'})
+        self.assertListEqual([b.run_location for b in breeders],
+                             [os.path.join(self.tmp_dir, 'a'), os.path.join(self.tmp_dir, 'b')])
+        self.assertDictEqual(breeders[1].custom_scheduler_settings, {'qos': 'debug'})
+
+    def test_write_array_batch_script(self):
+        breeders = [KelpieBreeder(input_structure_file=self.structure_file,
+                                  run_location=os.path.join(self.tmp_dir, 'run_{}'.format(i)))
+                    for i in range(3)]
+        batch_script_file = KelpieBreeder.write_array_batch_script(breeders, os.path.join(self.tmp_dir, 'array'))
+        with open(batch_script_file, 'r') as fr:
+            self.assertIn('SLURM_ARRAY_TASK_ID', fr.read())
+        with open(os.path.join(self.tmp_dir, 'array', 'run_locations.txt'), 'r') as fr:
+            self.assertListEqual(fr.read().split(), [b.run_location for b in breeders])
+        self.assertTrue(os.path.isfile(os.path.join(self.tmp_dir, 'run_2', 'initial_structure.vasp')))
+        breeders[1].custom_scheduler_settings = {'qos': 'debug'}
+        with self.assertRaises(KelpieBreederError):
+            KelpieBreeder.write_array_batch_script(breeders, os.path.join(self.tmp_dir, 'array'))
+
+    def test_submit_job_to_scheduler_job_id(self):
+        kb = KelpieBreeder(input_structure_file=self.structure_file,
+                           run_location=os.path.join(self.tmp_dir, 'run'),
+                           custom_scheduler_settings={'submit_cmd': self._write_fake_sbatch()})
+        kb._prepare_run_location()
+        kb.submit_job_to_scheduler(wait=True)
+        self.assertEqual(kb.job_id, '12345')
+        with open(os.path.join(self.tmp_dir, 'run', 'sbatch_args.txt'), 'r') as fr:
+            self.assertEqual(fr.read().split(), ['--parsable', '--wait', 'cori.q'])
+
+    def test_submit_many(self):
+        custom_scheduler_settings = {'submit_cmd': self._write_fake_sbatch(), 'output': 'job.out'}
+        breeders = [KelpieBreeder(input_structure_file=self.structure_file,
+                                  run_location=os.path.join(self.tmp_dir, 'run_{}'.format(i)),
+                                  custom_scheduler_settings=custom_scheduler_settings)
+                    for i in range(3)]
+        submission = KelpieBreeder.submit_many(breeders, os.path.join(self.tmp_dir, 'array'))
+        self.assertEqual(submission.returncode, 0)
+        self.assertListEqual([b.job_id for b in breeders], ['12345_0', '12345_1', '12345_2'])
+        with open(os.path.join(self.tmp_dir, 'array', 'sbatch_args.txt'), 'r') as fr:
+            self.assertEqual(fr.read().split(), ['--parsable', '--array=0-2', '--output=job_%a.out', 'cori.q'])
+        with self.assertRaises(KelpieBreederError):
+            KelpieBreeder.submit_many([], os.path.join(self.tmp_dir, 'array'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import os
+import unittest
+from kelpie import io
+from kelpie.calculation_workflows import RelaxationWorkflow
+
+
+sample_vasp_input_dir = os.path.join(os.path.dirname(__file__), 'sample_vasp_input')
+
+
+class TestGenericWorkflow(unittest.TestCase):
+    """Base class to test kelpie.calculation_workflows.GenericWorkflow class."""
+
+    def setUp(self):
+        self.structure = io.read_poscar(os.path.join(sample_vasp_input_dir, 'POSCAR.all_OK'))
+
+    def test_get_calculation_settings_defaults_not_mutated(self):
+        from kelpie.vasp_settings.incar import DEFAULT_VASP_INCAR_SETTINGS
+        for encut in [600, 700]:
+            workflow = RelaxationWorkflow(initial_structure=self.structure,
+                                          run_location=sample_vasp_input_dir,
+                                          custom_calculation_settings={'relaxation': {'encut': encut}},
+                                          mpi_call='srun vasp_std')
+            self.assertEqual(workflow.get_calculation_settings('relaxation')['encut'], encut)
+            self.assertEqual(workflow.get_calculation_settings('static'), DEFAULT_VASP_INCAR_SETTINGS['static'])
+        self.assertNotIn('encut', DEFAULT_VASP_INCAR_SETTINGS['relaxation'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import os
+import shutil
+import tempfile
+import unittest
+from kelpie import io
+from kelpie.grazer import KelpieGrazer
+
+
+sample_vasp_input_dir = os.path.join(os.path.dirname(__file__), 'sample_vasp_input')
+
+
+class TestKelpieGrazer(unittest.TestCase):
+    """Base class to test kelpie.grazer.KelpieGrazer class."""
+
+    def setUp(self):
+        self.run_location = tempfile.mkdtemp()
+        with open(os.path.join(self.run_location, 'mpi_call.txt'), 'w') as fw:
+            fw.write('srun vasp_std')
+
+    def tearDown(self):
+        shutil.rmtree(self.run_location)
+
+    def test_initial_structure_read_when_needed(self):
+        error_poscar = os.path.join(sample_vasp_input_dir, 'POSCAR.lattice_vectors_error')
+        grazer = KelpieGrazer(run_location=self.run_location, initial_structure_file=error_poscar)
+        with self.assertRaises(io.KelpieIOError):
+            grazer.initial_structure
+        grazer.initial_structure_file = os.path.join(sample_vasp_input_dir, 'POSCAR.all_OK')
+        self.assertEqual(len(grazer.initial_structure.atoms), 15)
+        self.assertIs(grazer.initial_structure, grazer.initial_structure)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,12 @@
 import os
+import shutil
+import sys
+import tempfile
 import unittest
+import warnings
+import numpy as np
 from kelpie import io
+from kelpie.structure import Atom, Structure
 
 
 sample_vasp_input_dir = os.path.join(os.path.dirname(__file__), 'sample_vasp_input')
@@ -17,16 +23,15 @@ class TestIOReadPOSCAR(unittest.TestCase):
 
     def setUp(self):
         self.poscar_OK = os.path.join(sample_vasp_input_dir, 'POSCAR.structure_OK')
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
 
     def test_poscar_file_not_found(self):
         with self.assertRaises(FileNotFoundError):
             io.read_poscar(poscar_file='POSCAR.file_not_found')
 
-    def test_consistent_number_of_atoms(self):
-        self.assertTrue(io._consistent_number_of_atoms(_poscar_lines(self.poscar_OK)))
-        error_poscar = os.path.join(sample_vasp_input_dir, 'POSCAR.consistent_number_of_atoms_error')
-        self.assertFalse(io._consistent_number_of_atoms(_poscar_lines(error_poscar)))
-
     def test_system_title(self):
         self.assertEqual(io._system_title(_poscar_lines(self.poscar_OK)), 'Fe-Li-O-P')
 
@@ -62,7 +67,7 @@ class TestIOReadPOSCAR(unittest.TestCase):
 
     def test_repeating_list_of_species(self):
         rl = ['Li']*6 + ['Mn1'] + ['Mn2'] + ['O']*7
-        self.assertEqual(io._repeating_list_of_species(_poscar_lines(self.poscar_OK)), rl)
+        self.assertEqual(io.PoscarParser(self.poscar_OK).read_repeating_list_of_species(), rl)
 
     def test_coordinate_system(self):
         self.assertEqual(io._coordinate_system(_poscar_lines(self.poscar_OK)), 'Direct')
@@ -76,12 +81,135 @@ class TestIOReadPOSCAR(unittest.TestCase):
     def test_list_of_atomic_coordinates(self):
         list_of_atomic_coordinates = io._list_of_atomic_coordinates(_poscar_lines(self.poscar_OK))
         self.assertEqual(len(list_of_atomic_coordinates), 15)
+        self.assertTupleEqual(list_of_atomic_coordinates.shape, (15, 3))
         self.assertEqual(len(list_of_atomic_coordinates[2]), 3)
         self.assertAlmostEqual(list_of_atomic_coordinates[14][0], 0.74999999)
         error_poscar = os.path.join(sample_vasp_input_dir, 'POSCAR.list_of_atomic_coordinates_error')
         with self.assertRaises(io.KelpieIOError):
             io._list_of_atomic_coordinates(_poscar_lines(error_poscar))
 
+    def test_read_poscar(self):
+        s = io.read_poscar(self.poscar_OK)
+        self.assertEqual(len(s.atoms), 15)
+        self.assertAlmostEqual(s.atoms[14].coordinates[0], 0.74999999)
+        error_poscar = os.path.join(sample_vasp_input_dir, 'POSCAR.consistent_number_of_atoms_error')
+        with self.assertRaises(io.KelpieIOError):
+            io.read_poscar(error_poscar)
+
+    def test_read_many_poscars(self):
+        all_OK = os.path.join(sample_vasp_input_dir, 'POSCAR.all_OK')
+        structures = io.read_many_poscars([self.poscar_OK, all_OK, self.poscar_OK], max_workers=2)
+        self.assertListEqual([s.POSCAR for s in structures],
+                             [io.read_poscar(f).POSCAR for f in [self.poscar_OK, all_OK, self.poscar_OK]])
+        with self.assertRaises(FileNotFoundError):
+            io.read_many_poscars([self.poscar_OK, 'POSCAR.file_not_found'])
+
+    def test_poscar_parser_is_lazy(self):
+        error_poscar = os.path.join(sample_vasp_input_dir, 'POSCAR.consistent_number_of_atoms_error')
+        parser = io.PoscarParser(error_poscar)
+        self.assertEqual(len(parser.read_lattice_vectors()), 3)
+        self.assertNotIn('read_list_of_atomic_coordinates', parser._cache)
+        with self.assertRaises(io.KelpieIOError):
+            parser.read_list_of_atomic_coordinates()
+
+    def test_poscar_parser_file_changed(self):
+        poscar_file = os.path.join(self.tmp_dir, 'CONTCAR')
+        shutil.copy(self.poscar_OK, poscar_file)
+        parser = io.PoscarParser(poscar_file)
+        with open(poscar_file, 'a') as fw:
+            fw.write('0.0 0.0 0.0\n')
+        with self.assertRaisesRegex(io.KelpieIOError, 'changed'):
+            parser.read_list_of_atomic_coordinates()
+        self.assertEqual(len(io.PoscarParser(poscar_file).read_list_of_atomic_coordinates()), 15)
+
+    def test_read_atomic_coordinates_by_axis(self):
+        parser = io.PoscarParser(self.poscar_OK)
+        x, y, z = parser.read_atomic_coordinates_by_axis()
+        self.assertTrue(z.flags['C_CONTIGUOUS'])
+        self.assertListEqual(y.tolist(), parser.read_list_of_atomic_coordinates()[:, 1].tolist())
+
+    def test_read_poscar_use_cache(self):
+        poscar_file = os.path.join(self.tmp_dir, 'POSCAR')
+        shutil.copy(self.poscar_OK, poscar_file)
+        s = io.read_poscar(poscar_file, use_cache=True)
+        self.assertTrue(os.path.isfile(poscar_file + '.parsed.npz'))
+        s_cached = io.read_poscar(poscar_file, use_cache=True)
+        self.assertEqual(s_cached.POSCAR, s.POSCAR)
+        self.assertIs(s_cached.atoms[0].species, sys.intern('Li'))
+        # a modified POSCAR is parsed again
+        with open(poscar_file, 'a') as fw:
+            fw.write('\n')
+        os.utime(poscar_file, ns=(0, 0))
+        self.assertEqual(io.read_poscar(poscar_file, use_cache=True).POSCAR, s.POSCAR)
+        # a truncated cache is ignored, and written again
+        with open(poscar_file + '.parsed.npz', 'r+b') as fw:
+            fw.truncate(100)
+        self.assertEqual(io.read_poscar(poscar_file, use_cache=True).POSCAR, s.POSCAR)
+        self.assertEqual(io.read_poscar(poscar_file, use_cache=True).POSCAR, s.POSCAR)
+
+    def test_read_atomic_coordinates_bytes(self):
+        atomic_coordinates = io._read_atomic_coordinates([b'0 0 0 Li', b'# comment', b'0.5 0.5 0.5', b'1 1 1'], 3)
+        self.assertListEqual(atomic_coordinates.tolist(), [[0., 0., 0.], [0.5, 0.5, 0.5]])
+        with self.assertRaisesRegex(io.KelpieIOError, 'Line 11'):
+            io._read_atomic_coordinates([b'0 0 0', b'', b'0.5 0.x 0.5'], 3)
+
+    def test_parse_coordinate_lines_no_data(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.assertTupleEqual(io._parse_coordinate_lines(['', '  # comment', '\n']).shape, (0, 3))
+            self.assertListEqual(io._parse_coordinate_lines([b'', b'0.5 0.5 0.5 # Li']).tolist(), [[0.5, 0.5, 0.5]])
+            error_poscar = os.path.join(sample_vasp_input_dir, 'POSCAR.consistent_number_of_atoms_error')
+            with self.assertRaises(io.KelpieIOError):
+                io.PoscarParser(error_poscar).read_list_of_atomic_coordinates()
+        self.assertListEqual(caught, [])
+
+    def test_read_atomic_coordinates_buffer(self):
+        with open(self.poscar_OK, 'rb') as fr:
+            buffer = fr.read().split(b'\n', 8)[8]
+        atomic_coordinates = io._read_atomic_coordinates_buffer(buffer, 15)
+        self.assertTupleEqual(atomic_coordinates.shape, (15, 3))
+        self.assertListEqual(atomic_coordinates.tolist(),
+                             io._list_of_atomic_coordinates(_poscar_lines(self.poscar_OK)).tolist())
+        with self.assertRaises(io.KelpieIOError):
+            io._read_atomic_coordinates_buffer(b'0.0 0.5 0.2\n0.err 0.1 0.3\n', 2)
+        with self.assertRaises(io.KelpieIOError):
+            io._read_atomic_coordinates_buffer(b'Direct\n0.0 0.5 0.2\n0.err 0.1 0.3\n', 2, offset=7)
+        self.assertListEqual(io._read_atomic_coordinates_buffer(b'Direct\n0.0 0.5 0.2\n', 1, offset=7).tolist(),
+                             [[0.0, 0.5, 0.2]])
+
+    def test_parse_coordinates_buffer_structure_poscar(self):
+        # values >= 10 written as "{:18.14f}" have 16+ digits, most of them trailing zeros
+        structure = Structure(lattice_vectors=[[20., 0., 0.], [0., 20., 0.], [0., 0., 20.]],
+                              coordinate_system='Cartesian',
+                              atoms=[Atom(coordinates=[12.5, 0.1, 10.], species='Li'),
+                                     Atom(coordinates=[-11.25, 3.3, 19.875], species='Li')])
+        buffer = np.frombuffer(structure.POSCAR.encode().split(b'\n', 8)[8], dtype=np.uint8)
+        atomic_coordinates, parsed = io._parse_coordinates_buffer(buffer, 2, io._EXACT_POWERS_OF_10)
+        self.assertTrue(parsed)
+        self.assertListEqual(atomic_coordinates.tolist(), [[12.5, 0.1, 10.], [-11.25, 3.3, 19.875]])
+        buffer = np.frombuffer(b'1.2345678901234567 0 0\n', dtype=np.uint8)
+        atomic_coordinates, parsed = io._parse_coordinates_buffer(buffer, 1, io._EXACT_POWERS_OF_10)
+        self.assertFalse(parsed)
+
+    def test_parse_coordinates_buffer_python(self):
+        # the pure Python body of the (possibly numba-compiled) kernel, so that it is tested with or without numba
+        parse_coordinates_buffer = getattr(io._parse_coordinates_buffer, 'py_func', io._parse_coordinates_buffer)
+        lines = ['12.50000000000000 -0.00000000000000 100.0',
+                 '  -3.25E+01  1.5e-3\t+7.000E2 T T F',
+                 '0.12345678901234 -10.10000000000000 4.0000e-05 Li',
+                 '-0.5 0.000000000000000000000 1E22',
+                 ]
+        buffer = np.frombuffer('\n'.join(lines).encode(), dtype=np.uint8)
+        atomic_coordinates, parsed = parse_coordinates_buffer(buffer, len(lines), io._EXACT_POWERS_OF_10)
+        self.assertTrue(parsed)
+        self.assertListEqual(atomic_coordinates.tolist(), np.loadtxt(lines, usecols=(0, 1, 2)).tolist())
+        # stops at a blank line or a comment
+        for separator in ['\n\n', '\n  # comment\n']:
+            buffer = np.frombuffer(separator.join(lines[:2]).encode(), dtype=np.uint8)
+            atomic_coordinates, parsed = parse_coordinates_buffer(buffer, 2, io._EXACT_POWERS_OF_10)
+            self.assertTrue(parsed)
+            self.assertListEqual(atomic_coordinates.tolist(), [[12.5, -0., 100.]])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,67 @@
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from kelpie.scheduler_status import SlurmStatusCache, SchedulerStatusError
+
+
+class TestSlurmStatusCache(unittest.TestCase):
+    """Base class to test kelpie.scheduler_status.SlurmStatusCache class."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.environ.get('PATH', '')
+
+    def tearDown(self):
+        os.environ['PATH'] = self.path
+        shutil.rmtree(self.tmp_dir)
+
+    def test_parse_squeue_output(self):
+        states = SlurmStatusCache._parse_squeue_output('12345 RUNNING\n12346_[0-9] PENDING\n12347_3 COMPLETING\n')
+        self.assertDictEqual(states, {'12345': 'RUNNING', '12346_[0-9]': 'PENDING', '12347_3': 'COMPLETING'})
+
+    def test_final_states_are_remembered(self):
+        cache = SlurmStatusCache()
+        cache._final_states['12345'] = 'COMPLETED'
+        self.assertEqual(cache.get(12345), 'COMPLETED')
+        self.assertIsNone(cache._last_refresh)
+
+    def test_only_terminal_states_are_remembered(self):
+        cache = SlurmStatusCache()
+        cache.refresh = lambda: None
+        cache._last_refresh = float('inf')
+        sacct_states = iter(['PENDING', 'RUNNING', 'COMPLETED'])
+        cache._query_sacct = lambda job_id: next(sacct_states)
+        self.assertEqual(cache.get('12345_7'), 'PENDING')
+        self.assertEqual(cache.get('12345_7'), 'RUNNING')
+        self.assertEqual(cache.get('12345_7'), 'COMPLETED')
+        self.assertEqual(cache.get('12345_7'), 'COMPLETED')
+        self.assertDictEqual(cache._final_states, {'12345_7': 'COMPLETED'})
+
+
+    def test_refresh_lists_array_tasks(self):
+        fake_squeue = os.path.join(self.tmp_dir, 'squeue')
+        args_file = os.path.join(self.tmp_dir, 'squeue_args.txt')
+        with open(fake_squeue, 'w') as fw:
+            fw.write('#!/bin/sh\necho "$@" > {}\n'.format(args_file))
+            fw.write('printf "12345_0 RUNNING\\n12345_1 PENDING\\n12345_2 PENDING\\n12345_3 PENDING\\n"\n')
+        os.chmod(fake_squeue, os.stat(fake_squeue).st_mode | stat.S_IEXEC)
+        os.environ['PATH'] = os.pathsep.join([self.tmp_dir, self.path])
+        cache = SlurmStatusCache()
+        cache._query_sacct = lambda job_id: self.fail('sacct queried for {}'.format(job_id))
+        self.assertEqual(cache.get('12345_3'), 'PENDING')
+        self.assertEqual(cache.get('12345_0'), 'RUNNING')
+        with open(args_file, 'r') as fr:
+            self.assertIn('-r', fr.read().split())
+
+    def test_scheduler_not_found(self):
+        os.environ['PATH'] = self.tmp_dir
+        with self.assertRaises(SchedulerStatusError):
+            SlurmStatusCache().refresh()
+        with self.assertRaises(SchedulerStatusError):
+            SlurmStatusCache._query_sacct('12345')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,6 +20,10 @@ class TestAtom(unittest.TestCase):
         with self.assertRaises(AtomError):
             Atom(coordinates=[0, 1, 2, 3], species='Al')
 
+    def test_nan_coordinate(self):
+        with self.assertRaisesRegex(AtomError, r'\(1\)'):
+            Atom(coordinates=[0, float('nan'), 0], species='Al')
+
     def test_no_species(self):
         with self.assertRaises(AtomError):
             Atom(coordinates=[0, 0, 0])
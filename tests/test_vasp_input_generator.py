@@ -1,4 +1,6 @@
 import os
+import shutil
+import tempfile
 import unittest
 from kelpie.vasp_input_generator import VaspInputGenerator, VaspInputError
 
@@ -9,6 +11,12 @@ sample_vasp_input_dir = os.path.join(os.path.dirname(__file__), 'sample_vasp_inp
 class TestVaspInputGenerator(unittest.TestCase):
     """Base class to test kelpie.vasp_input_generator.VaspInputGenerator class."""
 
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
     def test_structure_setter(self):
         from kelpie import io
         s = io.read_poscar(os.path.join(sample_vasp_input_dir, 'POSCAR.all_OK'))
@@ -25,6 +33,22 @@ class TestVaspInputGenerator(unittest.TestCase):
         self.assertTrue(self.ig.calculation_settings['lcharg'])
         self.assertAlmostEqual(self.ig.calculation_settings['potim'], 0.187)
 
+    def test_calculation_settings_setter_defaults_not_mutated(self):
+        from kelpie.vasp_settings.incar import DEFAULT_VASP_INCAR_SETTINGS
+        VaspInputGenerator(structure=os.path.join(sample_vasp_input_dir, 'POSCAR.all_OK'))
+        self.assertNotIn('encut', DEFAULT_VASP_INCAR_SETTINGS['relaxation'])
+        self.assertAlmostEqual(DEFAULT_VASP_INCAR_SETTINGS['relaxation']['ediff'], 1E-8)
+
+    def test_calculation_settings_setter_not_mutated(self):
+        from kelpie.vasp_settings.incar import DEFAULT_VASP_INCAR_SETTINGS
+        calc_sett = DEFAULT_VASP_INCAR_SETTINGS['relaxation']
+        for _ in range(2):
+            ig = VaspInputGenerator(structure=os.path.join(sample_vasp_input_dir, 'POSCAR.all_OK'),
+                                    calculation_settings=calc_sett)
+            self.assertAlmostEqual(ig.calculation_settings['ediff'], 15E-08)
+        self.assertNotIn('encut', calc_sett)
+        self.assertAlmostEqual(calc_sett['ediff'], 1E-8)
+
     def test_calculation_settings_setter_encut_ediff(self):
         self.assertAlmostEqual(self.ig.calculation_settings['encut'], 520.)
         self.assertAlmostEqual(self.ig.calculation_settings['ediff'], 15E-08)
@@ -58,6 +82,14 @@ class TestVaspInputGenerator(unittest.TestCase):
     def test_get_highest_enmax(self):
         self.assertAlmostEqual(self.ig.get_highest_enmax(self.ig.POTCAR), 499.034)
 
+    def test_get_highest_enmax_str_and_bytes(self):
+        potcar = ('  PAW_PBE Li_sv 10Sep2004\n'
+                  '   ENMAX  =  499.034; ENMIN  =  374.276 eV\n'
+                  '  PAW_PBE O 08Apr2002\n'
+                  '   ENMAX  =  400.000; ENMIN  =  300.000 eV\n')
+        self.assertAlmostEqual(VaspInputGenerator.get_highest_enmax(potcar), 499.034)
+        self.assertAlmostEqual(VaspInputGenerator.get_highest_enmax(potcar.encode()), 499.034)
+
     def test_roundup_encut(self):
         self.assertEqual(VaspInputGenerator.roundup_encut(271.335), 280)
 
@@ -80,6 +112,39 @@ class TestVaspInputGenerator(unittest.TestCase):
         self.assertTrue(os.path.isfile('Li6Mn2O7/INCAR'))
         shutil.rmtree('Li6Mn2O7')
 
+    def test_write_vasp_potcar_not_found(self):
+        calc_sett = self.ig.calculation_settings.copy()
+        calc_sett['potcar_settings'] = dict(calc_sett['potcar_settings'], element_potcars={'Li': 'Li_not_found'})
+        ig = VaspInputGenerator(structure=self.ig.structure, calculation_settings=calc_sett)
+        potcar_file = os.path.join(self.tmp_dir, 'POTCAR')
+        with self.assertRaises(VaspInputError):
+            ig._write_vasp_potcar(potcar_file)
+        self.assertFalse(os.path.exists(potcar_file))
+
+    def test_write_many_vasp_input_files(self):
+        from kelpie.vasp_input_generator import write_many_vasp_input_files
+        element_potcars = {}
+        for species in ['Li', 'Mn', 'O']:
+            element_potcars[species] = os.path.join(self.tmp_dir, 'POTCAR.{}'.format(species))
+            with open(element_potcars[species], 'w') as fw:
+                fw.write('  PAW_PBE {}\n   ENMAX  =  400.000; ENMIN  =  300.000 eV\n'.format(species))
+        calc_sett = self.ig.calculation_settings.copy()
+        calc_sett['potcar_settings'] = dict(calc_sett['potcar_settings'], element_potcars=element_potcars)
+        write_locations = [os.path.join(self.tmp_dir, 'calc_{}'.format(i)) for i in range(2)]
+        structure = os.path.join(sample_vasp_input_dir, 'POSCAR.all_OK')
+        write_many_vasp_input_files([(structure, calc_sett, write_location) for write_location in write_locations],
+                                    max_workers=2, chunksize=1)
+        for write_location in write_locations:
+            for vasp_input_file in ['POSCAR', 'POTCAR', 'INCAR']:
+                self.assertTrue(os.path.isfile(os.path.join(write_location, vasp_input_file)))
+            with open(os.path.join(write_location, 'POTCAR'), 'r') as fr:
+                self.assertEqual(fr.read().count('PAW_PBE'), 3)
+
+    def test_write_many_vasp_input_files_error(self):
+        from kelpie.vasp_input_generator import write_many_vasp_input_files
+        with self.assertRaises(VaspInputError):
+            write_many_vasp_input_files([('POSCAR.file_not_found', None, 'Li6Mn2O7')], max_workers=1)
+
 
 if __name__ == '__main__':
     unittest.main()
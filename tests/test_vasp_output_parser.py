@@ -38,12 +38,26 @@ class TestVasprunXMLParser(unittest.TestCase):
         self.assertIsInstance(energies, dict)
         self.assertAlmostEqual(energies[2], -17.56163366)
 
+    def test_read_last_free_energy(self):
+        from kelpie import vasp_output_parser as parser
+        vasprunxml_file = os.path.join(sample_vasp_output_dir, 'relaxation_vasprun.xml.gz')
+        self.assertAlmostEqual(parser.VasprunXMLParser.read_last_free_energy(vasprunxml_file), -17.56163366)
+        vasprunxml_file = os.path.join(sample_vasp_output_dir, 'static_vasprun.xml.gz')
+        free_energies = parser.VasprunXMLParser(vasprunxml_file).read_free_energies()
+        self.assertAlmostEqual(parser.VasprunXMLParser.read_last_free_energy(vasprunxml_file),
+                               free_energies[max(free_energies)])
+
     def test_read_forces(self):
         forces = self.vxparser.read_forces()
         self.assertEqual(len(forces.keys()), 3)
         self.assertListEqual(list(forces[0][2]), [0., 0., 0.])
         self.assertEqual(forces[1][1][0], 0.)
 
+    def test_read_forces_array(self):
+        forces = self.vxparser.read_forces_array()
+        self.assertTupleEqual(forces.shape, (3, 3, 3))
+        self.assertListEqual(list(forces[0][2]), [0., 0., 0.])
+
     def test_read_stress_tensors(self):
         stress_tensor = self.vxparser.read_stress_tensors()
         self.assertTupleEqual(stress_tensor[0].shape, (3, 3))
@@ -80,6 +94,7 @@ class TestVasprunXMLParser(unittest.TestCase):
         total_dos = self.vxparser.read_total_density_of_states()
         self.assertListEqual(list(total_dos.keys()), ['spin_1', 'spin_2'])
         self.assertAlmostEqual(total_dos['spin_2'][12][1], -0.1063)
+        self.assertEqual(total_dos['spin_1'].shape[1], 3)
 
     def test_read_band_occupations(self):
         occupations = self.vxparser.read_band_occupations()
@@ -99,6 +114,18 @@ class TestVasprunXMLParser(unittest.TestCase):
         self.assertEqual(len(scf_looptimes[0]), 15)
         self.assertListEqual(scf_looptimes[2][:3], [2.58, 2.47, 3.12])
 
+    def test_unread_blocks_are_discarded(self):
+        from kelpie import vasp_output_parser as parser
+        vxparser = parser.VasprunXMLParser(os.path.join(sample_vasp_output_dir, 'static_vasprun.xml.gz'))
+        self.assertEqual(len(vxparser.xmlroot.find('./calculation/projected')), 0)
+        self.assertEqual(len(vxparser.xmlroot.find('./calculation/dos/partial')), 0)
+        self.assertAlmostEqual(vxparser.read_fermi_energy(), -2.2358819)
+        self.assertEqual(len(vxparser.read_band_occupations()['spin_1']), 145)
+
+    def test_read_methods_are_cached(self):
+        self.assertIs(self.vxparser.read_forces(), self.vxparser.read_forces())
+        self.assertIn('read_forces', self.vxparser._cache)
+
 
 if __name__ == '__main__':
     unittest.main()